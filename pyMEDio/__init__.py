@@ -25,11 +25,11 @@
 #----------------------------------      
 
 
-__all__=['MEDWriter', 'MEDReader']
+__all__=['MEDWriter', 'MEDReader', 'Mesh', 'Field', 'merge_meshes', 'merge_fields', 'finalize_reserved_steps']
 
-from .writer import MEDWriter
+from .writer import MEDWriter, finalize_reserved_steps
 from .reader import MEDReader
-from .object_definition import Mesh, Field
+from .object_definition import Mesh, Field, merge_meshes, merge_fields
 
 import logging
 
@@ -0,0 +1,106 @@
+#==============================================================================
+# Copyright (C) 2016 Marchand Basile                                  
+#                                                                     
+# This file is part of pyMEDio  
+#                                                                     
+# pyMEDio is free software: you can redistribute it and/or modify   
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or   
+# any later version.                           
+#                                                               
+# pyMEDio is distributed in the hope that it will be useful,   
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the  
+# GNU General Public License for more details.
+#                                
+# You should have received a copy of the GNU General Public License 
+# along with pyPointer.  If not, see <http://www.gnu.org/licenses/>   
+#==============================================================================          
+#----------------------------------      
+# package    : pyMEDio     
+# file       : cache.py
+# content    : Memory bounded cache used by reader and writer                                          
+# author     : Basile Marchand (basile.marchand@gmail.com)                                                                     
+# date       : 17-07-2016                                                     
+#----------------------------------      
+
+from collections import OrderedDict
+import logging
+
+_LOGGER = logging.getLogger('pyMEDio.cache')
+
+
+def nbytes(obj):
+    """
+    Estimate the memory used by the numpy arrays held by obj
+    (arrays, lists, tuples, dict values and objects attributes)
+    """
+    if hasattr(obj, 'nbytes'):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum([nbytes(v) for v in obj.values()])
+    if isinstance(obj, (list, tuple)):
+        return sum([nbytes(v) for v in obj])
+    if hasattr(obj, '__dict__'):
+        return sum([nbytes(v) for v in vars(obj).values()])
+    return 0
+
+
+class LRUCache(object):
+    """
+    Least recently used cache bounded by the memory of the stored objects
+
+    Parameters
+    -----------
+    max_bytes : int or None
+        the memory cap in bytes, None means unbounded and 0 disables the cache
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.__items = OrderedDict()
+        self.__size = 0
+
+    def __contains__(self, key):
+        return key in self.__items
+
+    def __len__(self):
+        return len(self.__items)
+
+    @property
+    def size(self):
+        return self.__size
+
+    def get(self, key, default=None):
+        if key not in self.__items:
+            return default
+        self.__items.move_to_end(key)
+        return self.__items[key][0]
+
+    def put(self, key, value):
+        self.pop(key)
+        size = nbytes(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            _LOGGER.debug("object {} is larger than the cache, not stored".format(key))
+            return
+        self.__items[key] = (value, size)
+        self.__size += size
+        while self.max_bytes is not None and self.__size > self.max_bytes:
+            old_key, (_, old_size) = self.__items.popitem(last=False)
+            self.__size -= old_size
+            _LOGGER.debug("object {} removed from cache".format(old_key))
+
+    def pop(self, key):
+        if key in self.__items:
+            value, size = self.__items.pop(key)
+            self.__size -= size
+            return value
+        return None
+
+    def invalidate(self, match=None):
+        """
+        Remove the cached objects whose key satisfies match(key), all objects if match is None
+        """
+        for key in list(self.__items.keys()):
+            if match is None or match(key):
+                self.pop(key)
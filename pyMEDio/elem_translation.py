@@ -24,12 +24,48 @@
 # date       : 17-07-2016                                                     
 #----------------------------------      
 
-_MED2MED = {"PO1":{"nn":1,"id":"PO1","ngauss":0,"geo":'001'},
+import numpy as np
+
+_MED2MED = {"PO1":{"nn":1,"id":"PO1","ngauss":1,"geo":'001'},
             "SE2":{"nn":2,'id':"SE2","ngauss":1,"geo":'102'},
             "TR3":{"nn":3,'id':"TR3","ngauss":3,"geo":'203'},
-            "QU4":{"nn":4,'id':"QU4","ngauss":3,"geo":'204'},
+            "QU4":{"nn":4,'id':"QU4","ngauss":4,"geo":'204'},
             "TE4":{"nn":4,'id':"TE4","ngauss":4,"geo":'304'},
-            "PY5":{"nn":5,'id':"PY5","ngauss":4,"geo":'305'}}
+            "PY5":{"nn":5,'id':"PY5","ngauss":5,"geo":'305'}}
+
+
+### Gauss points localizations used for the fields on Gauss points, the number
+### of points is the _MED2MED ngauss one. For each type : the reference element
+### nodes coordinates, the Gauss points coordinates and weights (MED conventions)
+
+_TE4_A = (5. - np.sqrt(5.))/20.
+_TE4_B = (5. + 3.*np.sqrt(5.))/20.
+_QU4_A = 1./np.sqrt(3.)
+_PY5_H1 = 0.1531754163448146
+_PY5_H2 = 0.6372983346207416
+
+_MED_GAUSS = {"SE2":{"dim":1,
+                     "ref":[[-1.], [1.]],
+                     "gauss":[[0.]],
+                     "weights":[2.]},
+              "TR3":{"dim":2,
+                     "ref":[[0., 0.], [1., 0.], [0., 1.]],
+                     "gauss":[[1./6., 1./6.], [2./3., 1./6.], [1./6., 2./3.]],
+                     "weights":[1./6., 1./6., 1./6.]},
+              "QU4":{"dim":2,
+                     "ref":[[-1., -1.], [1., -1.], [1., 1.], [-1., 1.]],
+                     "gauss":[[-_QU4_A, -_QU4_A], [_QU4_A, -_QU4_A], [_QU4_A, _QU4_A], [-_QU4_A, _QU4_A]],
+                     "weights":[1., 1., 1., 1.]},
+              "TE4":{"dim":3,
+                     "ref":[[0., 1., 0.], [0., 0., 1.], [0., 0., 0.], [1., 0., 0.]],
+                     "gauss":[[_TE4_A, _TE4_A, _TE4_A], [_TE4_A, _TE4_A, _TE4_B],
+                              [_TE4_A, _TE4_B, _TE4_A], [_TE4_B, _TE4_A, _TE4_A]],
+                     "weights":[1./24., 1./24., 1./24., 1./24.]},
+              "PY5":{"dim":3,
+                     "ref":[[1., 0., 0.], [0., 1., 0.], [-1., 0., 0.], [0., -1., 0.], [0., 0., 1.]],
+                     "gauss":[[0.5, 0., _PY5_H1], [0., 0.5, _PY5_H1], [-0.5, 0., _PY5_H1],
+                              [0., -0.5, _PY5_H1], [0., 0., _PY5_H2]],
+                     "weights":[2./15., 2./15., 2./15., 2./15., 2./15.]}}
 
 
 ### Table for Reader class
@@ -48,7 +84,7 @@ _MED2MSH = {"PO1":{"nn":1,"id":15},
 
 ### Table for Writer class
 
-_GMSH2MED = None
+_GMSH2MED = dict((v['id'], {'id':k, 'nn':v['nn']}) for k, v in _MED2MSH.items())
 
 
 
@@ -58,6 +94,10 @@ _VTK2MED = {1:{'id':"PO1", 'nn':1, 'ngauss':0, 'geo':'001'},
             9:{'id':"QU4", 'nn':4},
             10:{'id':"TE4",'nn':4}}
 
+### Translation of the element type ids of a Mesh, given its SYNTAX
+
+_SYNTAX2MED = {"MED": _MED2MED, "VTK": _VTK2MED, "GMSH": _GMSH2MED}
+
 
 
 ### To delete
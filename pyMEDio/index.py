@@ -0,0 +1,100 @@
+#==============================================================================
+# Copyright (C) 2016 Marchand Basile                                  
+#                                                                     
+# This file is part of pyMEDio  
+#                                                                     
+# pyMEDio is free software: you can redistribute it and/or modify   
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or   
+# any later version.                           
+#                                                               
+# pyMEDio is distributed in the hope that it will be useful,   
+# but WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the  
+# GNU General Public License for more details.
+#                                
+# You should have received a copy of the GNU General Public License 
+# along with pyPointer.  If not, see <http://www.gnu.org/licenses/>   
+#==============================================================================          
+#----------------------------------      
+# package    : pyMEDio     
+# file       : index.py
+# content    : Persistent index of the MED files structure                                          
+# author     : Basile Marchand (basile.marchand@gmail.com)                                                                     
+# date       : 17-07-2016                                                     
+#----------------------------------      
+
+import os
+import json
+import hashlib
+import logging
+
+_LOGGER = logging.getLogger('pyMEDio.index')
+
+_INDEX_VERSION = 3
+
+
+def _cache_dir():
+    root = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(root, "pyMEDio")
+
+
+def index_path(med_file, location):
+    """
+    Return the path of the index of med_file
+
+    Parameters
+    -----------
+    med_file : string
+        the path of the MED file
+    location : string {"sidecar", "cache"} or directory path
+        "sidecar" stores the index next to the MED file (med_file + ".index.json"),
+        "cache" in the user cache directory and a path in the given directory
+    """
+    med_file = os.path.abspath(med_file)
+    if location == "sidecar":
+        return med_file + ".index.json"
+    if location == "cache":
+        location = _cache_dir()
+    key = hashlib.sha1(med_file.encode()).hexdigest()
+    return os.path.join(location, key + ".json")
+
+
+def _file_identity(med_file):
+    stat = os.stat(med_file)
+    return {"path": os.path.abspath(med_file), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def load_index(med_file, location):
+    """
+    Return the metadata stored in the index of med_file, None if there
+    is no index or if the MED file changed since it was written
+    """
+    path = index_path(med_file, location)
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if index.get("version") != _INDEX_VERSION or index.get("file") != _file_identity(med_file):
+        _LOGGER.debug("index {} is outdated".format(path))
+        return None
+    return index["metadata"]
+
+
+def save_index(med_file, location, metadata):
+    """
+    Write the metadata in the index of med_file, errors are only logged
+    as the index is an optimization
+    """
+    path = index_path(med_file, location)
+    index = {"version": _INDEX_VERSION, "file": _file_identity(med_file), "metadata": metadata}
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as error:
+        _LOGGER.warning("index {} can't be written : {}".format(path, error))
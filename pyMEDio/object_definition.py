@@ -25,61 +25,456 @@
 #----------------------------------      
 
 
+import sys
+import copy
+import logging
+import itertools
 import numpy as np
+from .elem_translation import _MED2MED, _SYNTAX2MED
+from .spatial import SpatialIndex
+
+_LOGGER = logging.getLogger('pyMEDio.object_definition')
+
+def _family_groups(name):
+    """
+    Return the tuple of the group names of a family, a family belongs to one
+    group (name is a string) or to several ones (name is a tuple of strings)
+    """
+    return name if isinstance(name, tuple) else (name,)
+
+
+def _families_groups(families, family_names, skip_zero=False):
+    """
+    Return the dictionnary {group name : sorted entities index} of a families array,
+    the entities of a family are in each group of the family, the named families
+    without entity are empty groups
+    """
+    order = np.argsort(families, kind='stable')
+    fam_ids, first = np.unique(families[order], return_index=True)
+    groups = {}
+    for fam_id, e_list in zip(fam_ids.tolist(), np.split(order, first[1:])):
+        if skip_zero and fam_id == 0:
+            continue
+        for name in _family_groups(family_names.get(fam_id, str(fam_id))):
+            groups.setdefault(name, []).append(e_list)
+    for name, e_lists in groups.items():
+        groups[name] = e_lists[0] if len(e_lists) == 1 else np.sort(np.concatenate(e_lists))
+    for fam_id, name in family_names.items():
+        if skip_zero and fam_id == 0:
+            continue
+        for group in _family_groups(name):
+            if group not in groups:
+                groups[group] = np.zeros(0, dtype=order.dtype)
+    return groups
+
+
+def _groups_families(groups, n, sign):
+    """
+    Return the families array of n entities and the dictionnary {family id : group
+    names} of a dictionnary {group name : entities index}. There is one family, of
+    sign sign, per distinct set of groups, the entities without group are in the
+    family 0.
+    """
+    names = [name for name in groups.keys() if name != "FAMILLE_ZERO"]
+    members = np.zeros((n, len(names)), dtype=bool)
+    for j, name in enumerate(names):
+        members[np.asarray(groups[name], dtype=np.int64), j] = True
+    ## one row of bits per entity, the distinct rows are the families
+    combos, inverse = np.unique(np.packbits(members, axis=1), axis=0, return_inverse=True)
+    combos = np.unpackbits(combos, axis=1, count=len(names)).astype(bool)
+    fam_ids = np.zeros(combos.shape[0], dtype=np.int32)
+    family_names = {}
+    in_groups = [tuple(np.flatnonzero(combo).tolist()) for combo in combos]
+    ## the one group families first, in the groups order
+    for k in sorted(range(len(in_groups)), key=lambda k: (len(in_groups[k]), in_groups[k])):
+        if len(in_groups[k]) == 0:
+            continue
+        fam_ids[k] = sign*(len(family_names)+1)
+        family_names[int(fam_ids[k])] = tuple(names[j] for j in in_groups[k]) if len(in_groups[k]) > 1 else names[in_groups[k][0]]
+    ## the groups without entity are kept as families without entity
+    used = set(itertools.chain.from_iterable(_family_groups(v) for v in family_names.values()))
+    for name in names:
+        if name not in used:
+            family_names[sign*(len(family_names)+1)] = name
+    if "FAMILLE_ZERO" in groups:
+        family_names[0] = "FAMILLE_ZERO"
+    return fam_ids[inverse.reshape(-1)], family_names
+
+
+def _merge_families(families, family_names, other_families, other_names, sign):
+    """
+    Merge the families of other entities in the ones of a first set of entities,
+    the families with the same group name are merged, the other families of other
+    get new ids, of sign sign. Returns the merged family_names and the new family
+    id of each other entity.
+    """
+    family_names = dict(family_names)
+    name_to_id = dict((v, k) for k, v in family_names.items())
+    other_ids = np.union1d(np.unique(other_families), list(other_names.keys())).astype(np.int32)
+    new_ids = np.zeros_like(other_ids)
+    used_ids = set(family_names.keys()) | set(np.unique(families).tolist())
+    used = [0] + list(used_ids) + other_ids.tolist()
+    next_id = sign*(max([sign*i for i in used]) + 1)
+    for i, fam_id in enumerate(other_ids.tolist()):
+        name = other_names.get(fam_id)
+        if name is not None and name in name_to_id:
+            new_ids[i] = name_to_id[name]
+        elif name is None and fam_id not in family_names:
+            new_ids[i] = fam_id
+        elif name is not None and fam_id not in used_ids:
+            ## the family id is kept when it is free
+            new_ids[i] = fam_id
+            family_names[fam_id] = name
+            name_to_id[name] = fam_id
+        else:
+            new_ids[i] = next_id
+            next_id += sign
+            family_names[int(new_ids[i])] = name
+            name_to_id[name] = int(new_ids[i])
+    return family_names, new_ids[np.searchsorted(other_ids, other_families)]
+
 
 class Mesh(object):
+    """
+    Mesh object
+
+    The connectivity is stored in a compact, array-backed, form :
+        -> NODES    : int32 array, nodes of all elements (0-based) in CSR layout
+        -> OFFSETS  : int64 array of size NE+1, nodes of element e are
+                      NODES[OFFSETS[e]:OFFSETS[e+1]]
+        -> TYPES    : int8 array of size NE, index of the element type in TYPE_IDS
+        -> FAMILIES : int32 array of size NE, family id of each element
+    TYPE_IDS is the list of element type ids (in the mesh SYNTAX, "MED", "VTK"
+    or "GMSH", see MEDReader output_format) and
+    FAMILY_NAMES the dictionnary {family id : group name}, the name is a tuple
+    of group names for a family in several groups.
+
+    The nodes families are stored the same way : NODE_FAMILIES, int32 array
+    of size NN, and NODE_FAMILY_NAMES. NODE_GROUPS {group name : sorted nodes
+    index} is built lazily, the nodes without family (0) are in no group.
+
+    CONNEC, ELEMS and GROUPS are views derived from these arrays, built
+    lazily at first access, as the spatial index used by nearest_nodes and
+    locate_points. CONNEC[e] is the list [e, type_id, group_name, n1, n2, ...]
+    kept for compatibility, it is costly on large meshes.
+    """
     
     def __init__(self, name):
         self.NAME = name
         self.NN   = None
         self.NE   = None
         self.COOR = None
-        self.CONNEC = None
-        self.ELEMS  = None
-        self.GROUPS = None
+        self.NODES    = None
+        self.OFFSETS  = None
+        self.TYPES    = None
+        self.TYPE_IDS = []
+        self.SYNTAX   = "MED"
+        self.FAMILIES = None
+        self.FAMILY_NAMES = {}
+        self.NODE_FAMILIES = None
+        self.NODE_FAMILY_NAMES = {}
+        self._clear_views()
+
+    def _clear_views(self):
+        self.__connec = None
+        self.__elems  = None
+        self.__groups = None
+        self.__node_groups = None
+        self.__spatial = None
+
+    @property
+    def COOR(self):
+        return self.__coor
+
+    @COOR.setter
+    def COOR(self, coor):
+        ## the views, and the spatial index, are rebuilt with the new coordinates
+        self.__coor = coor
+        self._clear_views()
+
+    def with_coordinates(self, coor):
+        """
+        Returns a mesh with other nodes coordinates (e.g. a deformed state of
+        the mesh) sharing, without copy, the connectivity, families and groups
+        of the mesh, the spatial index is not shared
+
+        Parameters
+        -----------
+        coor : ndarray
+            the nodes coordinates, array of size (NN, 3)
+        """
+        mesh = copy.copy(self)
+        ## the topology views are kept, only the spatial index depends on the coordinates
+        mesh.__coor = coor
+        mesh.__spatial = None
+        return mesh
+
+    def set_connectivity(self, nodes, offsets, types, type_ids, families=None, family_names=None):
+        """
+        Set the mesh connectivity from its CSR arrays
+
+        Parameters
+        -----------
+        nodes : ndarray
+            nodes of all elements (0-based)
+        offsets : ndarray
+            array of size NE+1, nodes of element e are nodes[offsets[e]:offsets[e+1]]
+        types : ndarray
+            array of size NE, index of the element type in type_ids
+        type_ids : list
+            the element type ids in the mesh syntax
+        families : ndarray optional,
+            array of size NE, family id of each element (default 0)
+        family_names : dict optional,
+            dictionnary {family id : group name}
+        """
+        self.OFFSETS  = np.asarray(offsets, dtype=np.int64)
+        self.NE       = self.OFFSETS.shape[0] - 1
+        self.NODES    = np.asarray(nodes, dtype=np.int32)
+        self.TYPES    = np.asarray(types, dtype=np.int8)
+        self.TYPE_IDS = list(type_ids)
+        if families is None:
+            self.FAMILIES = np.zeros(self.NE, dtype=np.int32)
+        else:
+            self.FAMILIES = np.asarray(families, dtype=np.int32)
+        self.FAMILY_NAMES = dict(family_names) if family_names is not None else {}
+        self._clear_views()
+
+    def set_node_families(self, families=None, family_names=None):
+        """
+        Set the nodes families
+
+        Parameters
+        -----------
+        families : ndarray optional,
+            array of size NN, family id of each node (default 0)
+        family_names : dict optional,
+            dictionnary {family id : group name}
+        """
+        if families is None:
+            self.NODE_FAMILIES = np.zeros(self.NN, dtype=np.int32)
+        else:
+            self.NODE_FAMILIES = np.asarray(families, dtype=np.int32)
+        self.NODE_FAMILY_NAMES = dict(family_names) if family_names is not None else {}
+        self.__node_groups = None
+
+    def set_blocks(self, blocks, family_names=None):
+        """
+        Set the mesh connectivity from per element type blocks
+
+        Parameters
+        -----------
+        blocks : dict
+            dictionnary {type_id : (nodes, fam, num)} with
+              nodes : ndarray (ne_t, nn), nodes of each element (0-based)
+              fam   : ndarray (ne_t,) or None, family id of each element
+              num   : ndarray (ne_t,) or None, element index (0-based) in the mesh,
+                      if None the elements are numbered after the previous blocks
+        family_names : dict optional,
+            dictionnary {family id : group name}
+        """
+        type_ids = list(blocks.keys())
+        nums = []
+        NE = 0
+        for nodes, fam, num in blocks.values():
+            if num is None:
+                num = np.arange(NE, NE+nodes.shape[0])
+            nums.append(np.asarray(num, dtype=np.int64))
+            NE += nodes.shape[0]
+
+        types = np.zeros(NE, dtype=np.int8)
+        families = np.zeros(NE, dtype=np.int32)
+        sizes = np.zeros(NE, dtype=np.int64)
+        for code, ((nodes, fam, _), num) in enumerate(zip(blocks.values(), nums)):
+            types[num] = code
+            sizes[num] = nodes.shape[1]
+            if fam is not None:
+                families[num] = fam
+        offsets = np.zeros(NE+1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        NODES = np.zeros(offsets[-1], dtype=np.int32)
+        for (nodes, _, _), num in zip(blocks.values(), nums):
+            NODES[offsets[num][:,None] + np.arange(nodes.shape[1])] = nodes
+        self.set_connectivity(NODES, offsets, types, type_ids, families, family_names)
+
+    def get_block(self, type_id):
+        """
+        Return the elements of a given type as a contiguous block
+
+        Parameters
+        -----------
+        type_id : the element type id in the mesh syntax
+
+        Returns
+        -----------
+        output : tuple (num, nodes, fam)
+            num   : (ne_t,) elements index
+            nodes : (ne_t, nn) nodes of each element (0-based)
+            fam   : (ne_t,) family id of each element
+        """
+        num = self.ELEMS[type_id]
+        if num.shape[0] == 0:
+            return num, np.zeros((0,0), dtype=np.int32), np.zeros(0, dtype=np.int32)
+        nn = self.OFFSETS[num[0]+1] - self.OFFSETS[num[0]]
+        nodes = self.NODES[self.OFFSETS[num][:,None] + np.arange(nn)]
+        return num, nodes, self.FAMILIES[num]
+
+    def get_elements_nodes(self, e_list):
+        """
+        Return the sorted index of the nodes used by the elements e_list
+        """
+        e_list = np.asarray(e_list, dtype=np.int64)
+        starts = self.OFFSETS[e_list]
+        sizes = self.OFFSETS[e_list+1] - starts
+        ## index in NODES of the nodes of all elements, without python loop
+        shift = np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+        return np.unique(self.NODES[shift + np.arange(shift.shape[0])])
+
+    def __get_spatial_index(self):
+        if self.__spatial is None:
+            self.__spatial = SpatialIndex(self)
+        return self.__spatial
+
+    def nearest_nodes(self, points):
+        """
+        Return the index of the nearest node of each point and its distance
+
+        Parameters
+        -----------
+        points : ndarray
+            the points coordinates, array of size (n, 3)
+        """
+        return self.__get_spatial_index().nearest_nodes(points)
+
+    def locate_points(self, points, tol=1e-6):
+        """
+        Return the element containing each point, TR3, QU4 and TE4 elements only,
+        and the weights of the element nodes at the point
+
+        Parameters
+        -----------
+        points : ndarray
+            the points coordinates, array of size (n, 3)
+        tol : float, default 1e-6
+            relative tolerance of the inside test
+
+        Returns
+        -----------
+        output : tuple (elements, nodes, weights)
+            elements : (n,) the element containing each point, -1 if not found
+            nodes    : (n, 4) the nodes of the element, -1 padded
+            weights  : (n, 4) the weights of the nodes, 0 padded
+        """
+        return self.__get_spatial_index().locate_points(points, tol)
+
+    def _group_name(self, fam_id):
+        return self.FAMILY_NAMES.get(fam_id, str(fam_id))
+
+    @property
+    def CONNEC(self):
+        if self.__connec is None and self.NODES is not None:
+            connec = np.empty(self.NE, dtype=object)
+            nodes = np.split(self.NODES, self.OFFSETS[1:-1])
+            types = self.TYPES.tolist()
+            fams  = self.FAMILIES.tolist()
+            for e in range(self.NE):
+                connec[e] = [e, self.TYPE_IDS[types[e]], self._group_name(fams[e])] + nodes[e].tolist()
+            self.__connec = connec
+        return self.__connec
+
+    @CONNEC.setter
+    def CONNEC(self, connec):
+        ## legacy definition : list of [num, type_id, group_name, n1, n2, ...]
+        if connec is None:
+            self.NODES = self.OFFSETS = self.TYPES = self.FAMILIES = None
+            self._clear_views()
+            return
+        NE = len(connec)
+        type_ids = []
+        fam_ids = {}
+        types = np.zeros(NE, dtype=np.int8)
+        families = np.zeros(NE, dtype=np.int32)
+        sizes = np.zeros(NE, dtype=np.int64)
+        for elem in connec:
+            e = elem[0]
+            if elem[1] not in type_ids:
+                type_ids.append(elem[1])
+            if elem[2] not in fam_ids:
+                fam_ids[elem[2]] = 0 if elem[2]=="FAMILLE_ZERO" else -(len(fam_ids)+1)
+            types[e] = type_ids.index(elem[1])
+            families[e] = fam_ids[elem[2]]
+            sizes[e] = len(elem) - 3
+        offsets = np.zeros(NE+1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        NODES = np.zeros(offsets[-1], dtype=np.int32)
+        for elem in connec:
+            NODES[offsets[elem[0]]:offsets[elem[0]+1]] = elem[3:]
+        family_names = dict((v, k) for k, v in fam_ids.items())
+        self.set_connectivity(NODES, offsets, types, type_ids, families, family_names)
+        self.__connec = connec
+
+    @property
+    def ELEMS(self):
+        if self.__elems is None and self.TYPES is not None:
+            self.__elems = {}
+            for code, type_id in enumerate(self.TYPE_IDS):
+                e_list = np.flatnonzero(self.TYPES == code)
+                if e_list.shape[0] != 0:
+                    self.__elems[type_id] = e_list
+        return self.__elems
+
+    @ELEMS.setter
+    def ELEMS(self, elems):
+        ## legacy definition : dictionnary {type_id : list of elements}
+        NE = self.NE if self.NE is not None else sum([len(v) for v in elems.values()])
+        self.TYPE_IDS = list(elems.keys())
+        self.TYPES = np.zeros(NE, dtype=np.int8)
+        for code, e_list in enumerate(elems.values()):
+            self.TYPES[np.asarray(e_list, dtype=np.int64)] = code
+        self.__connec = None
+        self.__elems = None
+
+    @property
+    def GROUPS(self):
+        if self.__groups is None and self.FAMILIES is not None:
+            self.__groups = _families_groups(self.FAMILIES, self.FAMILY_NAMES)
+        return self.__groups
+
+    @GROUPS.setter
+    def GROUPS(self, groups):
+        ## legacy definition : dictionnary {group_name : list of elements}
+        NE = self.NE if self.NE is not None else sum([len(v) for v in groups.values()])
+        self.FAMILIES, self.FAMILY_NAMES = _groups_families(groups, NE, -1)
+        self.__connec = None
+        self.__groups = None
+
+    @property
+    def NODE_GROUPS(self):
+        if self.__node_groups is None:
+            if self.NODE_FAMILIES is None:
+                return {}
+            self.__node_groups = _families_groups(self.NODE_FAMILIES, self.NODE_FAMILY_NAMES, skip_zero=True)
+        return self.__node_groups
+
+    @NODE_GROUPS.setter
+    def NODE_GROUPS(self, groups):
+        ## dictionnary {group_name : list of nodes}, nodes families are positive
+        families, family_names = _groups_families(groups, self.NN, 1)
+        self.set_node_families(families, family_names)
 
     def __repr__(self):
         text = "pyMEDio.Mesh object \n"
         text += "   NN : %i \n"%(self.NN)
         text += "   NE : %i \n"%(self.NE)
         text += "   GROUPS : " + " ; ".join(list(self.GROUPS.keys())) + "\n"
+        if len(self.NODE_GROUPS) != 0:
+            text += "   NODE_GROUPS : " + " ; ".join(list(self.NODE_GROUPS.keys())) + "\n"
         return text
         
     def merge_without_remove(self, other):
         ### Used to merge two meshes, don't remove double nodes !!
-        res = Mesh("merged")
-        res.NN = self.NN + other.NN
-        res.NE = self.NE + other.NE
-        #offset_coor = other.COOR + self.NE
-        res.COOR = np.concatenate((self.COOR, other.COOR),axis=0)
-        offset_connec = other.CONNEC
-        ## Merge connectivity table
-        for i,elem in enumerate(offset_connec):
-            tmp = np.array(elem[3:])
-            elem[0] += self.NE   ## offset elem numbering
-            tmp += self.NN  ## offset nodes numbering
-            offset_connec[i] = elem[:3] + tmp.tolist()
-
-        res.CONNEC = np.concatenate((self.CONNEC, offset_connec), axis=0)
-        ## Merge ELEMS dictionnary 
-        res.ELEMS = self.ELEMS
-        for key,value in other.ELEMS.items():
-            tmp = (np.array(value)+self.NE).tolist()
-            if key in res.ELEMS.keys():
-                res.ELEMS[key] += tmp
-            else:
-                res.ELEMS[key] = tmp
-
-        ## Merge groups dictionnary
-        res.GROUPS = self.GROUPS
-        for key,value in other.GROUPS.items():
-            tmp = (np.array(value)+self.NE).tolist()
-            if key in res.GROUPS.keys():
-                res.GROUPS[key] += tmp
-            else:
-                res.GROUPS[key] = tmp
-        return res
-
+        return merge_meshes([self, other])[0]
 
     def __add__(self, other):
         res = self.merge_without_remove(other)
@@ -87,25 +482,233 @@ class Mesh(object):
         
 
 
+def merge_meshes(meshes, tol=None, name="merged"):
+    """
+    Merge a list of meshes in one mesh, the nodes and elements of each mesh are
+    appended to the previous ones. Elements types and families with the same
+    group name are merged.
+
+    Parameters
+    -----------
+    meshes : list of Mesh
+        the meshes to merge
+    tol : float optional
+        if given the nodes closer than tol are merged, the merged node is the
+        first one, by default all nodes are kept
+    name : string optional
+        the name of the merged mesh
+
+    Returns
+    -----------
+    output : tuple (mesh, node_maps, elem_maps)
+        mesh : the merged Mesh
+        node_maps : list of arrays, node_maps[i][n] is the index in mesh of the
+                    node n of meshes[i]
+        elem_maps : list of arrays, elem_maps[i][e] is the index in mesh of the
+                    element e of meshes[i]
+    """
+    ## Merge elements types, in the order of their first occurrence
+    type_ids = []
+    for mesh in meshes:
+        for type_id in mesh.TYPE_IDS:
+            if type_id not in type_ids:
+                type_ids.append(type_id)
+
+    nodes, offsets, types, node_maps, elem_maps = [], [np.zeros(1, dtype=np.int64)], [], [], []
+    families, family_names = np.zeros(0, dtype=np.int32), {}
+    node_families, node_family_names = np.zeros(0, dtype=np.int32), {}
+    has_node_families = any(mesh.NODE_FAMILIES is not None for mesh in meshes)
+    NN, NE = 0, 0
+    for mesh in meshes:
+        type_map = np.array([type_ids.index(t) for t in mesh.TYPE_IDS], dtype=np.int8)
+        nodes.append(mesh.NODES + NN)
+        offsets.append(mesh.OFFSETS[1:] + offsets[-1][-1])
+        types.append(type_map[mesh.TYPES])
+        ## families with the same group name are merged
+        family_names, fam = _merge_families(families, family_names, mesh.FAMILIES, mesh.FAMILY_NAMES, -1)
+        families = np.concatenate((families, fam))
+        if has_node_families:
+            ## nodes families are positive
+            mesh_node_families = mesh.NODE_FAMILIES
+            if mesh_node_families is None:
+                mesh_node_families = np.zeros(mesh.NN, dtype=np.int32)
+            node_family_names, fam = _merge_families(node_families, node_family_names,
+                                                     mesh_node_families, mesh.NODE_FAMILY_NAMES, 1)
+            node_families = np.concatenate((node_families, fam))
+        node_maps.append(np.arange(NN, NN+mesh.NN))
+        elem_maps.append(np.arange(NE, NE+mesh.NE))
+        NN += mesh.NN
+        NE += mesh.NE
+
+    ## meshes with less than 3 coordinates are padded to the largest dimension
+    dim = max(mesh.COOR.shape[1] for mesh in meshes)
+    coor = np.concatenate([np.pad(mesh.COOR, ((0, 0), (0, dim-mesh.COOR.shape[1]))) for mesh in meshes], axis=0)
+    nodes = np.concatenate(nodes)
+    if tol is not None:
+        kept, new_index = np.unique(_coincident_nodes(coor, tol), return_inverse=True)
+        coor = coor[kept]
+        nodes = new_index[nodes]
+        if has_node_families:
+            node_families = node_families[kept]
+        node_maps = [new_index[n_map] for n_map in node_maps]
+
+    res = Mesh(name)
+    res.SYNTAX = meshes[0].SYNTAX
+    res.NN = coor.shape[0]
+    res.COOR = coor
+    res.set_connectivity(nodes, np.concatenate(offsets), np.concatenate(types), type_ids, families, family_names)
+    if has_node_families:
+        res.set_node_families(node_families, node_family_names)
+    return res, node_maps, elem_maps
+
+
+def _row_keys(array):
+    ## one comparable key per row of a 2D integer array
+    array = np.ascontiguousarray(array)
+    return array.view(np.dtype((np.void, array.dtype.itemsize*array.shape[1]))).ravel()
+
+
+def _coincident_nodes(coor, tol):
+    """
+    Return for each node the index of the first node of its group of coincident
+    nodes (nodes closer than tol, transitively). The nodes are hashed on a grid of
+    cell size tol, the neighbour nodes are searched in the adjacent cells.
+    """
+    NN = coor.shape[0]
+    q = np.floor(coor / tol).astype(np.int64)
+    keys = _row_keys(q)
+    order = np.argsort(keys, kind='stable')
+    cells, start, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    pairs_i, pairs_j = [], []
+    for shift in itertools.product((-1, 0, 1), repeat=q.shape[1]):
+        n_keys = _row_keys(q + np.array(shift, dtype=np.int64))
+        c = np.minimum(np.searchsorted(cells, n_keys), cells.shape[0]-1)
+        found = np.flatnonzero(cells[c] == n_keys)
+        cnt = counts[c[found]]
+        ## all pairs (node, node of the neighbour cell)
+        i = np.repeat(found, cnt)
+        pos = np.repeat(start[c[found]] - np.cumsum(cnt) + cnt, cnt) + np.arange(i.shape[0])
+        j = order[pos]
+        keep = (j < i) & (np.linalg.norm(coor[i] - coor[j], axis=1) <= tol)
+        pairs_i.append(i[keep])
+        pairs_j.append(j[keep])
+    i = np.concatenate(pairs_i)
+    j = np.concatenate(pairs_j)
+
+    ## connected components, each node takes the smallest index of its group
+    rep = np.arange(NN)
+    while True:
+        new = rep.copy()
+        np.minimum.at(new, i, rep[j])
+        np.minimum.at(new, j, rep[i])
+        new = new[new]
+        if np.array_equal(new, rep):
+            return rep
+        rep = new
+
+
+class MeshTopology(object):
+    """
+    Light description of a mesh iteration, only what field reads need :
+        -> ELEMS    : dict {MED type : index of the type elements in the mesh},
+                      a slice when the elements are numbered contiguously
+        -> FAMILIES : dict {MED type : family id of the type elements}
+    No coordinates nor connectivity are stored.
+    """
+
+    def __init__(self, name, iteration):
+        self.NAME = name
+        self.ITERATION = iteration
+        self.NN = None
+        self.NE = 0
+        self.ELEMS = {}
+        self.FAMILIES = {}
+
+    def add_block(self, e_type, num, fam):
+        """
+        Add the elements of type e_type, num are the elements index (0-based)
+        """
+        if num.shape[0] != 0 and num[-1] - num[0] == num.shape[0] - 1 and np.all(np.diff(num) == 1):
+            num = slice(int(num[0]), int(num[-1])+1)
+        self.ELEMS[e_type] = num
+        self.FAMILIES[e_type] = fam
+        self.NE += fam.shape[0]
+
+    def __repr__(self):
+        text = "pyMEDio.MeshTopology object \n"
+        text += "   MESH : %s (%s)\n"%(self.NAME, self.ITERATION)
+        text += "   NE   : %i \n"%(self.NE)
+        return text
+
+
+def _default_ngauss(type_id, syntax):
+    ## number of Gauss points of the elements type_id, given in the mesh syntax
+    med_type = _SYNTAX2MED[syntax].get(type_id, {"id": None})["id"]
+    return _MED2MED.get(med_type, {"ngauss": 1})["ngauss"]
+
+
 class Field(object):
-    def __init__(self, name, components, support, mesh):
+    """
+    Field object
+
+    The values are stored in a dense array of size (NN, NCOMPO) for a NODES field,
+    (NE, NCOMPO) for an ELEMS field and (NE, NGAUSS_MAX, NCOMPO) for a GAUSS field.
+    For a GAUSS field NGAUSS is the dictionnary {type_id : number of Gauss points},
+    by default the _MED2MED ngauss values of the MED types of the mesh types (see
+    Mesh.SYNTAX), the values of an element of type t are
+    field[e, :NGAUSS[t], :].
+
+    A field defined on a profile can keep only its values on the profile : with
+    index, the nodes or elements index of the profile, the values are stored in a
+    compact array of size (len(index), ...) and field[i] is the value of the
+    entity INDEX[i]. INDEX is not sorted in general : the fields read in a MED file
+    keep the profile order, element type by element type for ELEMS and GAUSS fields.
+    The dense values are computed on demand (see dense, to_dense).
+
+    The values are float64 by default, dtype gives an other storage type (the
+    fields read in a MED file keep the type of their dataset, see DTYPE).
+    """
+    def __init__(self, name, components, support, mesh, values=None, ngauss=None, index=None, dtype=None):
         self.NAME = name
         self.MESH = mesh
         self.COMPONENTS = components
         self.NCOMPO = len(components)
         self.SUPPORT = support
         self.PROFILS = None
+        self.NGAUSS = None
+        self.INDEX = None
         if support=="NODES":
             self.SIZE = (self.MESH.NN, self.NCOMPO)
         elif support=="ELEMS":
             self.SIZE = (self.MESH.NE, self.NCOMPO)
+        elif support=="GAUSS":
+            if ngauss is None:
+                ngauss = dict((t, _default_ngauss(t, self.MESH.SYNTAX)) for t in self.MESH.ELEMS.keys())
+            self.NGAUSS = ngauss
+            self.SIZE = (self.MESH.NE, max(list(ngauss.values())+[1]), self.NCOMPO)
         else:
             print("Error : support %s not supported yet"%(support))
 
-        self._init_values()
+        self._init_values(values, index, dtype)
+
+    def _init_values(self, values=None, index=None, dtype=None):
+        ## values, if given, is used as storage without copy
+        size = self.SIZE
+        if index is not None:
+            self.INDEX = np.asarray(index, dtype=np.int64)
+            size = (self.INDEX.shape[0],) + self.SIZE[1:]
+        if values is None:
+            self.__values = np.zeros(size, dtype=np.float64 if dtype is None else dtype)
+        elif values.shape != size:
+            _LOGGER.error("The field values buffer has shape {} instead of {}".format(values.shape, size))
+            sys.exit(5)
+        else:
+            self.__values = values
 
-    def _init_values(self):
-        self.__values = np.zeros(self.SIZE)
+    @property
+    def DTYPE(self):
+        return self.__values.dtype
 
     def __getitem__(self, item):
         return self.__values[item]
@@ -113,37 +716,57 @@ class Field(object):
     def __setitem__(self, item, value):
         self.__values[item] = value
 
-    def __merge_components(self, other):
-        if self.COMPONENTS == other.COMPONENTS:
-            merged_components = self.COMPONENTS
-        elif self.NCOMPO == other.NCOMPO:
-            _LOGGER.warning("The two fields  doesn't have the same components name, it is used : {}".format(";".join(self.COMPONENTS)))
-            merged_components = self.COMPONENTS
-        else:
-            _LOGGER.error("The two fields to merged doesn't have the same number of components")
-            sys.exit(3)
-        return self.NCOMPO, merged_components
+    def dense(self, fill=0.):
+        """
+        Returns the field values as a dense array of size SIZE, the values of
+        the entities out of INDEX are set to fill. The storage is returned
+        without copy for a dense field.
+        """
+        if self.INDEX is None:
+            return self.__values
+        res = np.full(self.SIZE, fill, dtype=self.__values.dtype)
+        res[self.INDEX, ...] = self.__values
+        return res
+
+    def to_dense(self, fill=0.):
+        """
+        Switches the field to the dense storage
+        """
+        if self.INDEX is not None:
+            self.__values = self.dense(fill)
+            self.INDEX = None
 
     def __add__(self, other):
-        merged_name = self.NAME
-        nbr_comp, comp = self.__merge_components(other)
-        if self.SUPPORT != other.SUPPORT:
-            _LOGGER.error("The two fields to merge are defined to different level")
-            sys.exit(4)
-        supp = self.SUPPORT        
-        mesh = self.MESH + other.MESH
-        res = Field(merged_name, comp, supp, mesh)
-        
-        res[:] = np.concatenate((self.__values, other[:]), axis=0)
-
-        if self.PROFILS is not None:
-            prof_name1 = list(self.PROFILS.keys())[0]
-            prof_name2 = list(other.PROFILS.keys())[0]
-            if res.SUPPORT == "NODES":
-                prof_index = np.concatenate((self.PROFILS[prof_name1],(other.PROFILS[prof_name2]+self.MESH.NN)), axis=0) 
-            elif res.SUPPORT == "ELEMS":
-                prof_index = np.concatenate((self.PROFILS[prof_name1],(other.PROFILS[prof_name2]+self.MESH.NE)), axis=0)
-            res.PROFILS = {prof_name1 : prof_index}
+        return merge_fields([self, other])
+
+    def evaluate(self, points, tol=1e-6):
+        """
+        Evaluate the field at a set of points, a NODES field is interpolated with
+        the element shape functions and an ELEMS field is constant by element
+        (see Mesh.locate_points)
+
+        Parameters
+        -----------
+        points : ndarray
+            the points coordinates, array of size (n, 3)
+        tol : float, default 1e-6
+            relative tolerance of the points location
+
+        Returns
+        -----------
+        output : ndarray
+            the values (n, NCOMPO), NaN for the points out of the mesh
+        """
+        elements, nodes, weights = self.MESH.locate_points(points, tol)
+        values = self.dense()
+        if self.SUPPORT == "NODES":
+            res = np.einsum('ik,ikj->ij', weights, values[np.maximum(nodes, 0)])
+        elif self.SUPPORT == "ELEMS":
+            res = values[np.maximum(elements, 0)].astype(np.float64)
+        else:
+            _LOGGER.error("Field defined at the {} level can't be evaluated at points".format(self.SUPPORT))
+            sys.exit(6)
+        res[elements < 0] = np.nan
         return res
         
 
@@ -152,4 +775,68 @@ class Field(object):
         text += "   Field Name : %s \n"%(self.NAME)
         text += "   Components : " + " ; ".join(self.COMPONENTS) + "\n"
         text += "   Size       : " + " ; ".join([str(x) for x in self.SIZE]) + "\n"
+        if self.INDEX is not None:
+            text += "   Stored     : %i entities (profile)\n"%(self.INDEX.shape[0])
         return text
+
+
+def _merge_components(fields):
+    first = fields[0]
+    for other in fields[1:]:
+        if other.NCOMPO != first.NCOMPO:
+            _LOGGER.error("The two fields to merged doesn't have the same number of components")
+            sys.exit(3)
+        elif other.COMPONENTS != first.COMPONENTS:
+            _LOGGER.warning("The two fields  doesn't have the same components name, it is used : {}".format(";".join(first.COMPONENTS)))
+    return first.NCOMPO, first.COMPONENTS
+
+
+def merge_fields(fields, mesh=None, node_maps=None, elem_maps=None, tol=None):
+    """
+    Merge a list of fields defined on different meshes
+
+    Parameters
+    -----------
+    fields : list of Field
+        the fields to merge, defined at the same level
+    mesh, node_maps, elem_maps : optional
+        the merged mesh of the fields meshes and the renumbering maps, as returned
+        by merge_meshes. If None the meshes are merged, give them to merge several
+        steps without merging the meshes again.
+    tol : float optional
+        the tolerance of merge_meshes, if the meshes are merged
+
+    Returns
+    -----------
+    output : Field
+        the merged field, on coincident nodes the value of the last field is kept
+    """
+    first = fields[0]
+    nbr_comp, comp = _merge_components(fields)
+    if any(field.SUPPORT != first.SUPPORT for field in fields):
+        _LOGGER.error("The two fields to merge are defined to different level")
+        sys.exit(4)
+    supp = first.SUPPORT
+    if mesh is None:
+        mesh, node_maps, elem_maps = merge_meshes([field.MESH for field in fields], tol)
+    maps = node_maps if supp == "NODES" else elem_maps
+    ngauss = None
+    if supp == "GAUSS":
+        ngauss = {}
+        for field in fields[::-1]:
+            ngauss.update(field.NGAUSS)
+    res = Field(first.NAME, comp, supp, mesh, ngauss=ngauss,
+                dtype=np.result_type(*[field.DTYPE for field in fields]))
+
+    for field, e_map in zip(fields, maps):
+        index = e_map if field.INDEX is None else e_map[field.INDEX]
+        if supp == "GAUSS":
+            res[index, :field[:].shape[1]] = field[:]
+        else:
+            res[index] = field[:]
+
+    ## the merged profile is the union of the fields profiles
+    if all(field.PROFILS is not None for field in fields):
+        prof_index = [e_map[idx] for field, e_map in zip(fields, maps) for idx in field.PROFILS.values()]
+        res.PROFILS = {list(first.PROFILS.keys())[0]: np.unique(np.concatenate(prof_index))}
+    return res
@@ -25,16 +25,37 @@
 #----------------------------------      
 
 import sys
-from operator import itemgetter
 import numpy as np
 import h5py
 import logging
 from .elem_translation import _MED2VTK, _MED2MSH, _MED2MED
-from .object_definition import Mesh, Field
+from .object_definition import Mesh, MeshTopology, Field
+from .cache import LRUCache
+from .index import load_index, save_index
 
 
 _LOGGER = logging.getLogger('pyMEDio.reader')
 
+
+def _is_gauss(attrs):
+    """
+    Test if the attributes of a field entity group describe values at the Gauss points
+    """
+    gau = attrs.get('GAU', b'')
+    if isinstance(gau, bytes):
+        gau = gau.decode()
+    return len(gau.strip()) > 0 or int(attrs.get('NGA', 1)) > 1
+
+def _read_history_steps(args):
+    """
+    Read the history of a set of steps, run in the worker processes of read_history
+    """
+    med_file, mmap, cache_size, field_id, entities, components, steps, ngauss = args
+    med = MEDReader(med_file, mmap=mmap, cache_size=cache_size)
+    res = med._read_history(field_id, entities, components, steps, ngauss)
+    med.end()
+    return res
+
 class MEDReader(object):
     """
     MEDReader class 
@@ -46,10 +67,12 @@ class MEDReader(object):
     -> Read fields in the MED file : 
         -> Fields defined at the nodes level
         -> Fields defined at the elements level
+        -> Fields defined at the Gauss points level
 
     """
 
-    def __init__(self, med_file, output_format="MED"):
+    def __init__(self, med_file, output_format="MED", cache_size=512*2**20, mmap=False, index=None, swmr=False,
+                 pad_coordinates=True):
         """ 
         MEDReader class __init__ function 
         
@@ -59,18 +82,93 @@ class MEDReader(object):
             the path of the med_file to read
         output_format : string {"MED", "VTK", "GMSH"}, default MED
             the syntax used for the returned mesh
+        cache_size : int or None, default 512 MB
+            memory cap, in bytes, of the cache of meshes and mesh topologies
+            used by the fields reading, None means unbounded and 0 disables it
+        mmap : bool, default False
+            if True the contiguous and uncompressed datasets (nodes coordinates,
+            connectivity, fields values) are memory mapped instead of copied,
+            the returned arrays are then read-only
+        index : None or string {"sidecar", "cache"} or directory path, default None
+            if given, the structure of the file (meshes, fields, supports, components
+            and steps) is stored in a persistent index, see pyMEDio.index, and reused
+            when the same unchanged file (path, size, mtime) is opened again : the
+            fields steps and supports are then not read in the HDF5 file
+        swmr : bool, default False
+            if True the file is opened in HDF5 single writer multiple readers mode,
+            to read a MED file while it is written by a MEDWriter(swmr=True),
+            the steps written since the file was opened are found with refresh()
+            or poll_new_steps()
+        pad_coordinates : bool, default True
+            if True the nodes coordinates of 1D and 2D meshes are padded with
+            zeros to 3 columns, else they keep the number of columns (ESP) stored
+            in the MED file
 
         """ 
+        self.__swmr = swmr
+        self.__pad_coordinates = pad_coordinates
+        self.__seen_steps = {}
+        ## {(mesh name, topology key) : iteration of the last mesh read}, see read_mesh
+        self.__mesh_topologies = {}
         try:
-            self.med_root = h5py.File(med_file,'r')
+            self.med_root = self.__open(med_file)
             _LOGGER.info("MED file {} succesfully opened".format(med_file))
         except IOError:
             _LOGGER.error("MED file {} doesn't exist".format(med_file))
             sys.exit(1)
         
         self.__set_translator(output_format)
-        self.__readed_meshes = {} 
+        self.__output_format = output_format
+        self.__cache = LRUCache(cache_size)
+        self.__mmap = mmap
+        self.__metadata = None
+        if index is not None:
+            self.__metadata = load_index(med_file, index)
+            if self.__metadata is None:
+                self.__metadata = self.scan_metadata()
+                save_index(med_file, index, self.__metadata)
     
+    def __open(self, med_file):
+        if self.__swmr:
+            return h5py.File(med_file, 'r', libver='latest', swmr=True)
+        return h5py.File(med_file, 'r')
+
+    def refresh(self):
+        """
+        Method which updates the reader with the steps written in the MED file
+        since it was opened, while it is being written in SWMR mode. The HDF5
+        objects can't be created in SWMR mode, the steps are reserved before (see
+        MEDWriter.reserve_field_steps) : only the list of the written steps of each
+        field and the values change. The steps index and the metadata are reset,
+        the datasets are refreshed when they are read.
+        """
+        self.__metadata = None
+        self.__cache.invalidate(lambda key: key[0] == "STEPS")
+
+    def poll_new_steps(self, field_id):
+        """
+        Method which returns the steps of a field appended since the last call
+        (all the steps at the first call), the reader is refreshed first
+
+        Parameters
+        -----------
+        field_id : string
+              the name of the field
+
+        Returns
+        -----------
+        output : list of tuple
+              the new steps (time step, time value) sorted by time step, [] if
+              the field is not written yet
+        """
+        self.refresh()
+        if field_id not in self.med_root['/CHA'].keys():
+            return []
+        seen = self.__seen_steps.setdefault(field_id, set())
+        new_steps = [step for step in self._get_field_steps(field_id) if step not in seen]
+        seen.update(new_steps)
+        return sorted(new_steps)
+
     def __set_translator(self, output_format):
         """
         set the dictionnary to use for the elements names according to 
@@ -90,7 +188,33 @@ class MEDReader(object):
         return self.med_root[grp_level].attrs
     
     def read_data(self, grp_level):
-        return self.med_root[grp_level][:]
+        return self._get_array(self.med_root[grp_level])
+
+    def _map_dataset(self, dataset):
+        """
+        Return a read-only memory mapped view of the dataset when the reader is in
+        mmap mode and the dataset storage allows it, i.e. contiguous, uncompressed,
+        allocated in the file itself, None otherwise
+        """
+        if not self.__mmap or self.med_root.driver not in ("sec2", "stdio"):
+            return None
+        if dataset.chunks is not None or dataset.external is not None or dataset.size == 0:
+            return None
+        if dataset.dtype.kind not in "iuf":
+            return None
+        offset = dataset.id.get_offset()
+        if offset is None:
+            return None
+        return np.memmap(self.med_root.filename, dtype=dataset.dtype, mode='r', offset=offset, shape=dataset.shape)
+
+    def _get_array(self, dataset):
+        """
+        Return the content of the dataset, a memory mapped view if possible (see _map_dataset)
+        """
+        array = self._map_dataset(dataset)
+        if array is None:
+            array = dataset[:]
+        return array
 
     def get_meshes_names(self):
         """
@@ -102,6 +226,8 @@ class MEDReader(object):
             the list of all meshes name stored in the MED file
         """
 
+        if self.__metadata is not None:
+            return list(self.__metadata["meshes"].keys())
         return list(self.med_root['/ENS_MAA'])
 
     def get_mesh_info(self, mesh_name):
@@ -134,22 +260,53 @@ class MEDReader(object):
         med_grp_name = []
         grp_salome_list = list(self.med_root['FAS'][mesh_name]['ELEME'].keys())
         for grp_key in grp_salome_list:
-            name_bytes = self.med_root['FAS'][mesh_name]['ELEME'][grp_key]["GRO"]['NOM'][:].tostring()
-            name = name_bytes.decode().rstrip("\x00").rstrip()
-            med_grp_name.append(name)
+            for word in self.med_root['FAS'][mesh_name]['ELEME'][grp_key]["GRO"]['NOM'][:]:
+                name = word.tobytes().decode().rstrip("\x00").rstrip()
+                if name not in med_grp_name:
+                    med_grp_name.append(name)
 
         info['GROUPS'] = med_grp_name
         return info
 
-    def read_mesh(self, msh_name=None):
+    def get_mesh_iterations(self, msh_name=None):
+        """
+        Method which returns the iterations (computation steps) of a mesh
+
+        Parameters
+        ------------
+        msh_name : string optional,
+             the name of the mesh, the first mesh if None
+
+        Returns
+        -----------
+        output : list of tuple
+             the iterations (NDT, NOR, PDT) : time step, iteration number and
+             time value, in the order of the MED file
+        """
+        if msh_name is None:
+            msh_name = list(self.med_root['/ENS_MAA'])[0]
+        iterations = []
+        for grp_it in self.med_root['ENS_MAA'][msh_name].values():
+            iterations.append((int(grp_it.attrs['NDT']), int(grp_it.attrs['NOR']), float(grp_it.attrs['PDT'])))
+        return iterations
+
+    def read_mesh(self, msh_name=None, iteration=None):
         """
         method which read mesh definitionand return a Mesh object
+
+        The iterations of a mesh which differ only by their nodes coordinates
+        (deformed mesh, see MEDWriter.write_mesh_iteration) share their topology :
+        when an iteration with the same topology has already been read, only
+        the coordinates are read and the returned Mesh shares the connectivity,
+        families and groups arrays of the previous one (see Mesh.with_coordinates).
         
         Parameters
         ------------
         msh_name : string optional,
              the name of the mesh to read, if None it is the first mesh
              defined in the med file which is read
+        iteration : tuple (NDT, NOR) optional,
+             the mesh iteration to read, the first one if None
 
         Returns
         -----------
@@ -160,109 +317,199 @@ class MEDReader(object):
         if msh_name==None:
             mesh_list = list(self.med_root['/ENS_MAA'])
             msh_name = mesh_list[0]
-            
-        NN, COOR = self._read_nodes_data(msh_name)
-        NE, CONNEC, ELEM_BY_TYPES, GROUP_DIC = self._read_elem_data(msh_name)
-
-        mesh = Mesh(msh_name)
-        mesh.NN     = NN
-        mesh.NE     = NE
-        mesh.COOR   = COOR
-        mesh.CONNEC = CONNEC
-        mesh.ELEMS  = ELEM_BY_TYPES
-        mesh.GROUPS = GROUP_DIC
-
-        self.__readed_meshes[mesh.NAME] = mesh
+
+        iden = self._get_mesh_iden(msh_name, iteration)
+        topology_key = (msh_name, self._get_topology_key(msh_name, iden))
+        shared = None
+        if topology_key in self.__mesh_topologies:
+            shared = self.__cache.get(("MESH", msh_name, self.__mesh_topologies[topology_key]))
+
+        NN, COOR = self._read_nodes_data(msh_name, iden)
+        if shared is not None:
+            mesh = shared.with_coordinates(COOR)
+        else:
+            NE, blocks, family_names = self._read_elem_data(msh_name, iden)
+
+            mesh = Mesh(msh_name)
+            mesh.SYNTAX = self.__output_format
+            mesh.NN     = NN
+            mesh.COOR   = COOR
+            mesh.set_blocks(blocks, family_names)
+            node_families, node_family_names = self._read_node_families(msh_name, iden)
+            mesh.set_node_families(node_families, node_family_names)
+
+        self.__mesh_topologies[topology_key] = iden
+        self.__cache.put(("MESH", msh_name, iden), mesh)
         return mesh
 
-    def _read_nodes_data(self, msh_name):
+    def _get_mesh_iden(self, msh_name, iteration=None):
+        """
+        Return the name of the group of the mesh iteration (NDT, NOR),
+        the first iteration if None or if the iteration doesn't exist
         """
-        Method which reads nodal information about mesh, i.e. nodes coordinates
-        """ 
         iden_list = list(self.med_root['ENS_MAA'][msh_name].keys())
-        if len(iden_list) > 1:
-            _LOGGER.warning("MED file contains multiple mesh iteration (default iteration 0 is read)")
-        iden = iden_list[0]
-        try:
-            NUM = np.array(self.med_root['ENS_MAA'][msh_name][iden]['NOE']['NUM'], dtype=np.int32)
-        except:
-            _LOGGER.info("nodes initialy not numbering")
-            NN = self.med_root['ENS_MAA'][msh_name][iden]['NOE']['COO'].attrs['NBR']
-            NUM = np.arange(1,NN+1)
+        if iteration is not None:
+            iden = "%020d%020d"%(iteration[0], iteration[1])
+            if iden in iden_list:
+                return iden
+            _LOGGER.debug("mesh {} has no iteration {}, first one used".format(msh_name, iteration))
+        return iden_list[0]
+
+    def _get_topology_key(self, msh_name, iden):
+        """
+        Return a key identifying the topology of a mesh iteration, the iterations
+        which only differ by their coordinates link (HDF5 links) the same
+        elements group and nodes families dataset, and have the same key
+        """
+        grp_it = self.med_root['ENS_MAA'][msh_name][iden]
+        key = []
+        if 'MAI' in grp_it:
+            key.append(hash(grp_it['MAI'].id))
+        if 'FAM' in grp_it['NOE']:
+            key.append(hash(grp_it['NOE']['FAM'].id))
+        return tuple(key)
+
+    def get_topology(self, msh_name, iteration=None):
+        """
+        Method which returns the topology of a mesh iteration, i.e. the elements
+        index and families of each element type, without reading coordinates
+        and connectivity. Topologies are cached by mesh name and topology, the
+        iterations sharing their elements (see read_mesh) share the topology.
+
+        Parameters
+        ------------
+        msh_name : string
+             the name of the mesh
+        iteration : tuple (NDT, NOR) optional,
+             the mesh iteration, if None the first one is used
+
+        Returns
+        -----------
+        output : MeshTopology
+        """
+        iden = self._get_mesh_iden(msh_name, iteration)
+        key = ("TOPOLOGY", msh_name, self._get_topology_key(msh_name, iden))
+        topology = self.__cache.get(key)
+        if topology is None:
+            topology = self._read_topology(msh_name, iden)
+            self.__cache.put(key, topology)
+        return topology
+
+    def _read_topology(self, msh_name, iden):
+        grp_it = self.med_root['ENS_MAA'][msh_name][iden]
+        topology = MeshTopology(msh_name, iden)
+        topology.NN = grp_it['NOE']['COO'].attrs['NBR']
+        for key_type in grp_it['MAI'].keys():
+            grp_type = grp_it['MAI'][key_type]
+            NE_t = grp_type['NOD'].attrs['NBR']
+            if 'NUM' in grp_type.keys():
+                num = grp_type['NUM'][:].astype(np.int64) - 1
+            else:
+                num = np.arange(topology.NE, topology.NE+NE_t)
+            if 'FAM' in grp_type.keys():
+                fam = grp_type['FAM'][:]
+            else:
+                fam = np.zeros(NE_t, dtype=np.int32)
+            topology.add_block(key_type, num, fam)
+        return topology
+
+    def clear_cache(self, msh_name=None):
+        """
+        Method which removes the cached meshes and topologies, only those
+        of mesh msh_name if given
+        """
+        if msh_name is None:
+            self.__cache.invalidate()
+        else:
+            self.__cache.invalidate(lambda key: key[1]==msh_name)
 
-        NN = NUM.shape[0]
+    def _read_nodes_data(self, msh_name, iden=None):
+        """
+        Method which reads nodal information about mesh, i.e. nodes coordinates
+        of the mesh iteration iden, the first one if None
+        """ 
+        if iden is None:
+            iden = self._get_mesh_iden(msh_name)
+        NN = self.med_root['ENS_MAA'][msh_name][iden]['NOE']['COO'].attrs['NBR']
         
-        COOR = np.array(self.med_root['ENS_MAA'][msh_name][iden]['NOE']['COO']).reshape((-1,NN)).T
-        if COOR.shape[1]!=3:
-            COOR = np.concatenate((COOR, np.zeros((NN,1))),axis=1)
+        COOR = self._get_array(self.med_root['ENS_MAA'][msh_name][iden]['NOE']['COO']).reshape((-1,NN)).T
+        if COOR.shape[1]<3 and self.__pad_coordinates:
+            COOR = np.concatenate((COOR, np.zeros((NN,3-COOR.shape[1]), dtype=COOR.dtype)),axis=1)
         _LOGGER.info("nodes have been read")
         _LOGGER.info("nn = {}".format(NN))
         return NN, COOR
 
-    def _read_elem_data(self, msh_name):
+    def _read_families(self, msh_name, entity):
         """
-        Method which reads elements informations about mesh, i.e. connectivity and elements groups
+        Method which reads the families of the mesh entities, entity is 'ELEME'
+        or 'NOEUD', returns the dictionnary {family id : group name}, the name is
+        a tuple for a family in several groups
         """
-        NE = 0
-        iden = list(self.med_root['ENS_MAA'][msh_name].keys())[0]
-        list_elem_types = list(self.med_root['ENS_MAA'][msh_name][iden]['MAI'].keys())
-        for key in list_elem_types:
-            NE += self.med_root['ENS_MAA'][msh_name][iden]['MAI'][key]['NUM'].attrs['NBR']
-
-        med_grp_name = {}
-        grp_salome_list = list(self.med_root['FAS'][msh_name]['ELEME'].keys())
-        for grp_key in grp_salome_list:
-            name_bytes = self.med_root['FAS'][msh_name]['ELEME'][grp_key]["GRO"]['NOM'][:]
-            name_tmp = []
-            for word in name_bytes:
-                name_tmp.append(word.tostring().decode().rstrip("\x00").rstrip())
-            name = "_".join(name_tmp)
-            if 'FAMILLE_ZERO' in name:
+        family_names = {}
+        if msh_name not in self.med_root['FAS'] or entity not in self.med_root['FAS'][msh_name].keys():
+            return family_names
+        grp_fas = self.med_root['FAS'][msh_name][entity]
+        for grp_key in grp_fas.keys():
+            if "GRO" not in grp_fas[grp_key].keys():
                 continue
-            med_id = str(self.med_root['FAS'][msh_name]['ELEME'][grp_key].attrs['NUM'])
-            med_grp_name[med_id] = name
-        
-        if "FAMILLE_ZERO" in self.med_root['FAS'][msh_name].keys():
-            med_grp_name[str(0)] = "FAMILLE_ZERO"
-    
-        _LOGGER.info("reading elements")
-        _LOGGER.info("ne = {}".format(NE))
-        CONNEC = np.zeros(NE,dtype=list)
-        group_list = np.zeros((NE,2),dtype=int)
+            name_bytes = grp_fas[grp_key]["GRO"]['NOM'][:]
+            names = tuple([word.tobytes().decode().rstrip("\x00").rstrip() for word in name_bytes])
+            if 'FAMILLE_ZERO' in names:
+                continue
+            family_names[int(grp_fas[grp_key].attrs['NUM'])] = names[0] if len(names) == 1 else names
+        return family_names
 
-        ELEM_BY_TYPES = {}
-        for key in self.__translator.keys():
-            ELEM_BY_TYPES[self.__translator[key]['id']] = []
+    def _read_node_families(self, msh_name, iden=None):
+        """
+        Method which reads the nodes families of the mesh, returns the family id
+        of each node (None if the mesh has no nodes families) and the dictionnary
+        {family id : group name}
+        """
+        if iden is None:
+            iden = self._get_mesh_iden(msh_name)
+        grp_noe = self.med_root['ENS_MAA'][msh_name][iden]['NOE']
+        family_names = self._read_families(msh_name, 'NOEUD')
+        if 'FAM' not in grp_noe.keys():
+            return None, family_names
+        return grp_noe['FAM'][:], family_names
 
-        for key_type in list_elem_types:
+    def _read_elem_data(self, msh_name, iden=None):
+        """
+        Method which reads elements informations about mesh, i.e. connectivity and elements families
+
+        Returns
+        -----------
+        output : tuple (NE, blocks, family_names)
+            NE : number of elements
+            blocks : dict {type_id : (nodes, fam, num)}, the per type element blocks
+                     (see Mesh.set_blocks), all indices are 0-based
+            family_names : dict {family id : group name}
+        """
+        if iden is None:
+            iden = self._get_mesh_iden(msh_name)
+        grp_mai = self.med_root['ENS_MAA'][msh_name][iden]['MAI']
+
+        family_names = self._read_families(msh_name, 'ELEME')
+        if msh_name in self.med_root['FAS'] and "FAMILLE_ZERO" in self.med_root['FAS'][msh_name].keys():
+            family_names[0] = "FAMILLE_ZERO"
+
+        _LOGGER.info("reading elements")
+        NE = 0
+        blocks = {}
+        for key_type in grp_mai.keys():
             n_nodes = self.__translator[key_type]["nn"]
-            tmp_connec = np.array(self.med_root['ENS_MAA'][msh_name][iden]['MAI'][key_type]['NOD']).reshape((n_nodes,-1))-1
-            tmp_connec = tmp_connec.T
-            tmp_num = np.array(self.med_root['ENS_MAA'][msh_name][iden]['MAI'][key_type]['NUM']) - 1
-            tmp_grp = np.array(self.med_root['ENS_MAA'][msh_name][iden]['MAI'][key_type]['FAM'])
-            e_id = self.__translator[key_type]['id']
-            group_list[tmp_num,:] = np.column_stack((tmp_grp, tmp_num))
-            for e_num,e_grp,e_connec in zip(tmp_num,tmp_grp,tmp_connec):
-                CONNEC[e_num] = [e_num, e_id, med_grp_name[str(e_grp)]]+ e_connec.tolist()
-                ELEM_BY_TYPES[e_id].append(e_num)
-                
-        ### Create the group dictionnary
-        list_grp_name = list(set(group_list[:,0].tolist() + [0]))
-        group_list.view('i8,i8').sort(order=['f1'], axis=0)
-        group_dic = {}
-        for key,value in med_grp_name.items():
-            group_dic[value]= group_list[group_list[:,0]==int(key),1].astype(int).tolist()
-            list_grp_name.remove(int(key))
-            
-        for grp_id in list_grp_name:
-            group_dic[str(grp_id)] = group_list[group_list[:,0]==grp_id,1].astype(int).tolist()
+            grp_type = grp_mai[key_type]
+            nodes = self._get_array(grp_type['NOD']).reshape((n_nodes,-1)).T - 1
+            fam = grp_type['FAM'][:] if 'FAM' in grp_type.keys() else None
+            if 'NUM' in grp_type.keys():
+                num = grp_type['NUM'][:].astype(np.int64) - 1
+            else:
+                num = np.arange(NE, NE+nodes.shape[0])
+            NE += nodes.shape[0]
+            blocks[self.__translator[key_type]['id']] = (nodes, fam, num)
+        _LOGGER.info("ne = {}".format(NE))
         _LOGGER.info('------------------------------------------')
-    
-        FINAL_ELEM_BY_TYPES = {}
-        for k,v in ELEM_BY_TYPES.items():
-            if len(v)!=0:
-                FINAL_ELEM_BY_TYPES[k] = v
-        return NE, CONNEC, FINAL_ELEM_BY_TYPES, group_dic
+        return NE, blocks, family_names
 
 
     def get_field_info(self, field):
@@ -275,8 +522,92 @@ class MEDReader(object):
         return field_info
 
     def get_fields_names(self):
+        if self.__metadata is not None:
+            return list(self.__metadata["fields"].keys())
         return list(self.med_root['/CHA/'].keys())
 
+    def get_metadata(self):
+        """
+        Method which returns the description of the MED file (see scan_metadata),
+        from the index if the reader uses one
+        """
+        if self.__metadata is None:
+            self.__metadata = self.scan_metadata()
+        return self.__metadata
+
+    def scan_metadata(self):
+        """
+        Method which collects the description of the MED file : meshes, elements
+        types count, groups, fields, supports, components and steps. Only
+        attributes are read, except the (small) groups names datasets, and the
+        steps subtrees are not visited : the support of a field is the one of its
+        first step.
+
+        Returns
+        -----------
+        output : dict
+            {"meshes" : {mesh_name : {"iterations", "NN", "NE", "ELEMS", "GROUPS", "NODE_GROUPS"}},
+             "fields" : {field_name : {"mesh", "support", "components", "steps", "NOR"}}}
+            with only python types, it can be dumped in json. The steps are the
+            (time step, time value) of the field and NOR their iteration numbers.
+        """
+        meshes = {}
+        fields = {}
+
+        def _str(value):
+            return value.decode() if isinstance(value, bytes) else str(value)
+
+        def _mesh(mesh_name):
+            return meshes.setdefault(mesh_name, {"iterations": [], "NN": 0, "NE": 0, "ELEMS": {},
+                                                 "GROUPS": [], "NODE_GROUPS": []})
+
+        for mesh_name, grp_mesh in self.med_root.get('ENS_MAA', {}).items():
+            mesh = _mesh(mesh_name)
+            mesh["iterations"] = list(grp_mesh.keys())
+            if len(mesh["iterations"]) == 0:
+                continue
+            ## element types and nodes are counted on the first iteration only
+            grp_it = grp_mesh[mesh["iterations"][0]]
+            if 'NOE' in grp_it and 'COO' in grp_it['NOE']:
+                mesh["NN"] = int(grp_it['NOE/COO'].attrs['NBR'])
+            if 'MAI' in grp_it:
+                for e_type, grp_type in grp_it['MAI'].items():
+                    if 'NOD' in grp_type:
+                        mesh["ELEMS"][e_type] = int(grp_type['NOD'].attrs['NBR'])
+                        mesh["NE"] += mesh["ELEMS"][e_type]
+
+        for mesh_name, grp_fas in self.med_root.get('FAS', {}).items():
+            for entity, key in (('ELEME', "GROUPS"), ('NOEUD', "NODE_GROUPS")):
+                if entity not in grp_fas:
+                    continue
+                groups = _mesh(mesh_name)[key]
+                for grp_fam in grp_fas[entity].values():
+                    if 'GRO' not in grp_fam:
+                        continue
+                    for word in grp_fam['GRO/NOM'][:]:
+                        name = word.tobytes().decode().rstrip("\x00").rstrip()
+                        if name != 'FAMILLE_ZERO' and name not in groups:
+                            groups.append(name)
+
+        for field_id, grp_sol in self.med_root.get('CHA', {}).items():
+            n_compo = int(grp_sol.attrs['NCO'])
+            comp_crude = grp_sol.attrs['NOM']
+            field = {"mesh": _str(grp_sol.attrs['MAI']), "support": None,
+                     "components": [_str(comp_crude[(i*16):(i+1)*16].strip()) for i in range(n_compo)],
+                     "steps": [], "NOR": []}
+            fields[field_id] = field
+            for grp_t in grp_sol.values():
+                attrs = grp_t.attrs
+                field["steps"].append((int(attrs['NDT']), float(attrs['PDT'])))
+                field["NOR"].append(int(attrs['NOR']))
+            if len(field["steps"]) != 0:
+                field["support"] = self._get_field_support(field_id, None, None)[0]
+            written = self._get_written_steps(field_id)
+            if written is not None:
+                field["NOR"] = [nor for (t, _), nor in zip(field["steps"], field["NOR"]) if t in written]
+                field["steps"] = [(t, written[t]) for t, _ in field["steps"] if t in written]
+        return {"meshes": meshes, "fields": fields}
+
     def read_field(self, field_id):
         """ 
         Method which read all iterations, time step, of a given field
@@ -290,62 +621,427 @@ class MEDReader(object):
            out : (list)
                the list of all time step for the given field name
         """
-        list_steps = self._get_field_steps(field_id)
-        field_list = []
-        for time, ite in list_steps:
-            field = self.read_field_at_time(field_id, time, ite)
-            field_list.append(field)
-        return field_list
+        return [field for _, field in self.iter_field(field_id)]
+
+    def iter_field(self, field_id, steps=None, out=None):
+        """ 
+        Generator which read the time steps of a given field one at a time,
+        the memory used doesn't depend on the number of steps
+        
+        Parameter 
+        ---------
+           field_id : (str)
+               name of the fields steps to read
+           steps : (list) optional
+               the (time, ite) steps to read, all steps if None
+           out : (ndarray) optional
+               buffer of size (NN or NE, NCOMPO) reused to store the values of
+               each step, the previous yielded field is overwritten
+        Output
+        -------
+           out : (generator)
+               yield the tuples ((time, ite), field)
+        """
+        if steps is None:
+            steps = self._get_field_steps(field_id)
+        for time, ite in steps:
+            yield (time, ite), self.read_field_at_time(field_id, time, ite, out=out)
         
     def _get_field_steps(self, field_id):
+        if self.__metadata is not None:
+            return [tuple(step) for step in self.__metadata["fields"][field_id]["steps"]]
         grp_sol = self.med_root['/CHA/'][field_id]
+        written = self._get_written_steps(field_id)
         list_steps = []
         for index in grp_sol.keys():
             time = grp_sol[index].attrs["NDT"]
             ite  = grp_sol[index].attrs["PDT"]
+            if written is not None:
+                if int(time) not in written:
+                    continue
+                ite = written[int(time)]
             list_steps.append( (time, ite) )
         return list_steps
 
-    def read_field_at_time(self, field_id, time, ite):
+    def _get_written_steps(self, field_id):
+        """
+        Return the dictionnary {step number : time value} of the written steps of a
+        field whose steps are reserved (see MEDWriter.reserve_field_steps), None for
+        the other fields, all their steps are written
+        """
+        if 'SWMR' not in self.med_root or field_id not in self.med_root['SWMR']:
+            return None
+        progress = self.med_root['SWMR'][field_id]
+        if self.__swmr:
+            progress.refresh()
+        progress = progress[:]
+        return dict(zip(progress['NDT'].tolist(), progress['PDT'].tolist()))
+
+    def read_history(self, field_id, entities, components=None, steps=None, jobs=1):
+        """
+        Method which read the values of a few nodes, or elements, along the steps of a field.
+        For each step only the requested entities and components are read (see read_field_at_time).
+
+        Parameters
+        -----------
+        field_id : string
+              the name of the field
+        entities : list or ndarray
+              the nodes, or elements, index
+        components : list of string optional
+              the names of the components to read, all if None
+        steps : list optional
+              the (time, ite) steps to read, all steps if None
+        jobs : int, default 1
+              the number of processes used to read the steps
+
+        Returns
+        -----------
+        output : ndarray
+              array (n_steps, n_entities, n_components), or (n_steps, n_entities,
+              n_gauss_max, n_components) for a Gauss points field, NaN for the
+              entities where the field isn't defined (profile)
+        """
+        if steps is None:
+            steps = self._get_field_steps(field_id)
+        entities = np.asarray(entities, dtype=np.int64)
+        ngauss = None
+        if len(steps) > 0 and self._get_field_support(field_id, steps[0][0], steps[0][1])[0] == "GAUSS":
+            ngauss = max(self.get_gauss_points(field_id, steps[0][0]).values())
+        if jobs <= 1 or len(steps) < 2:
+            return self._read_history(field_id, entities, components, steps, ngauss)
+
+        from multiprocessing import Pool
+        chunks = np.array_split(np.arange(len(steps)), min(jobs, len(steps)))
+        tasks = [(self.med_root.filename, self.__mmap, self.__cache.max_bytes, field_id, entities, components,
+                  [steps[i] for i in chunk], ngauss) for chunk in chunks]
+        pool = Pool(len(tasks))
+        try:
+            res = pool.map(_read_history_steps, tasks)
+        finally:
+            pool.close()
+            pool.join()
+        return np.concatenate(res, axis=0)
+
+    def _read_history(self, field_id, entities, components, steps, ngauss=None):
+        if components is None:
+            components = self._get_field_components(field_id)
+        if ngauss is None:
+            history = np.full((len(steps), entities.shape[0], len(components)), np.nan)
+        else:
+            history = np.full((len(steps), entities.shape[0], ngauss, len(components)), np.nan)
+        for i, (time, ite) in enumerate(steps):
+            _, val, _, _, index = self.read_field_values(field_id, time, ite, components, entities)
+            if index is None:
+                ## values of all nodes sorted by index
+                history[i] = val[entities]
+                continue
+            if index.shape[0] == 0:
+                continue
+            order = np.argsort(index)
+            pos = np.minimum(np.searchsorted(index[order], entities), index.shape[0]-1)
+            found = index[order[pos]] == entities
+            if ngauss is None:
+                history[i, found] = val[order[pos[found]]]
+            else:
+                ## the elements with less Gauss points are padded with zeros
+                n_g = min(val.shape[1], ngauss)
+                history[i, found, :n_g] = val[order[pos[found]], :n_g]
+                history[i, found, n_g:] = 0.
+        return history
+
+    def get_step_index(self, field_id):
+        """
+        Method which returns the index of the steps of a field, built once and cached
+
+        Returns
+        -----------
+        output : dict
+            {"NDT", "NOR", "PDT" : ndarray, "KEYS" : list} the time step numbers,
+            iteration numbers, time values and HDF5 keys of the steps, sorted
+            by time value then time step
+        """
+        key = ("STEPS", field_id)
+        steps = self.__cache.get(key)
+        if steps is None and self.__metadata is not None:
+            field = self.__metadata["fields"][field_id]
+            ndt = np.array([step[0] for step in field["steps"]], dtype=np.int64)
+            nor = np.array(field["NOR"], dtype=np.int64)
+            pdt = np.array([step[1] for step in field["steps"]], dtype=np.float64)
+            order = np.lexsort((nor, ndt, pdt))
+            steps = {"NDT": ndt[order], "NOR": nor[order], "PDT": pdt[order],
+                     "KEYS": ["%.20d%.20d"%(ndt[i], nor[i]) for i in order]}
+            self.__cache.put(key, steps)
+        elif steps is None:
+            grp_sol = self.med_root['/CHA/'][field_id]
+            keys = list(grp_sol.keys())
+            ndt = np.array([grp_sol[k].attrs["NDT"] for k in keys], dtype=np.int64)
+            nor = np.array([grp_sol[k].attrs["NOR"] for k in keys], dtype=np.int64)
+            pdt = np.array([grp_sol[k].attrs["PDT"] for k in keys], dtype=np.float64)
+            written = self._get_written_steps(field_id)
+            if written is not None:
+                ## only the reserved steps written are read, with their time value
+                kept = np.flatnonzero(np.isin(ndt, list(written.keys())))
+                keys = [keys[i] for i in kept]
+                ndt, nor = ndt[kept], nor[kept]
+                pdt = np.array([written[t] for t in ndt.tolist()], dtype=np.float64)
+            order = np.lexsort((nor, ndt, pdt))
+            steps = {"NDT": ndt[order], "NOR": nor[order], "PDT": pdt[order],
+                     "KEYS": [keys[i] for i in order]}
+            self.__cache.put(key, steps)
+        return steps
+
+    def _get_step_group(self, field_id, time):
+        """
+        Return the HDF5 group of the step time (NDT) of a field
+        """
+        grp_sol = self.med_root['/CHA/'][field_id]
+        key = "%.20d%.20d"%(time, time)
+        if key not in grp_sol:
+            ## iteration number (NOR) different of the time step number
+            steps = self.get_step_index(field_id)
+            match = np.flatnonzero(steps["NDT"] == time)
+            if match.shape[0] == 0:
+                _LOGGER.error("The field {} has no time step {}".format(field_id, time))
+                sys.exit(2)
+            key = steps["KEYS"][match[-1]]
+        return grp_sol[key]
+
+    def _get_step_mesh_iteration(self, field_id, time):
+        """
+        Return the mesh iteration (RDT, ROR) of the step time of a field, None
+        if it is not given
+        """
+        attrs = self._get_step_group(field_id, time).attrs
+        if 'RDT' not in attrs:
+            return None
+        return (int(attrs['RDT']), int(attrs['ROR']))
+
+    def get_step_at(self, field_id, value, side="nearest"):
+        """
+        Method which returns the step of a field at, or around, a time value,
+        using a binary search in the step index
+
+        Parameters
+        -----------
+        field_id : string
+              the name of the field
+        value : float
+              the time value
+        side : string {"nearest", "before", "after"}, default "nearest"
+              the step returned : the nearest one, the last one with a time
+              value lower or equal, the first one with a time value greater or equal
+
+        Returns
+        -----------
+        output : tuple (time, ite)
+              the step time step number and time value, as in get_field_info
+        """
+        steps = self.get_step_index(field_id)
+        pdt = steps["PDT"]
+        after = min(np.searchsorted(pdt, value, side="left"), pdt.shape[0]-1)
+        before = max(np.searchsorted(pdt, value, side="right") - 1, 0)
+        if side == "before":
+            i = before
+        elif side == "after":
+            i = after
+        else:
+            i = before if abs(value - pdt[before]) <= abs(pdt[after] - value) else after
+        return (steps["NDT"][i], steps["PDT"][i])
+
+    def read_field_at_value(self, field_id, value, interpolate=False, **kwargs):
+        """
+        Method which read a field at a time value
+
+        Parameters
+        -----------
+        field_id : string
+              the name of the field
+        value : float
+              the time value
+        interpolate : bool, default False
+              if False the nearest step is read, if True the field is linearly
+              interpolated between the two steps around value (the first or last
+              step outside of the steps time values)
+        kwargs : the selection arguments of read_field_at_time (components, entities, group)
+
+        Returns
+        -----------
+        output : Field
+        """
+        if not interpolate:
+            time, ite = self.get_step_at(field_id, value)
+            return self.read_field_at_time(field_id, time, ite, **kwargs)
+
+        t_0, pdt_0 = self.get_step_at(field_id, value, side="before")
+        t_1, pdt_1 = self.get_step_at(field_id, value, side="after")
+        field = self.read_field_at_time(field_id, t_0, pdt_0, **kwargs)
+        if t_1 == t_0 or pdt_1 == pdt_0:
+            return field
+        field_1 = self.read_field_at_time(field_id, t_1, pdt_1, **kwargs)
+        weight = (value - pdt_0) / (pdt_1 - pdt_0)
+        if field.INDEX is not None and field_1.INDEX is not None and np.array_equal(field.INDEX, field_1.INDEX):
+            res = Field(field_id, field.COMPONENTS, field.SUPPORT, field.MESH, ngauss=field.NGAUSS, index=field.INDEX,
+                        dtype=np.result_type(field.DTYPE, field_1.DTYPE))
+            res[:] = (1. - weight)*field[:] + weight*field_1[:]
+        else:
+            res = Field(field_id, field.COMPONENTS, field.SUPPORT, field.MESH, ngauss=field.NGAUSS,
+                        dtype=np.result_type(field.DTYPE, field_1.DTYPE))
+            res[:] = (1. - weight)*field.dense() + weight*field_1.dense()
+        res.PROFILS = field.PROFILS
+        return res
+
+    def read_field_at_time(self, field_id, time, ite, out=None, components=None, entities=None, group=None, sparse=False):
+        """
+        Method which read one time step of a given field, possibly only a part of it
+
+        Parameters
+        -----------
+        field_id : string
+              the name of the field to read
+        time : int
+              the time step to read
+        ite : int
+              the iteration to read
+        out : ndarray optional
+              buffer used to store the field values (see iter_field)
+        components : list of string optional
+              the names of the components to read, all if None
+        entities : ndarray optional
+              the nodes, or elements, index to read
+        group : string optional
+              the name of the group of elements to read, for a nodal
+              field the nodes of the node group, or of the group
+              elements, are read
+        sparse : bool, default False
+              if True a field defined on a profile, or on a selection, keeps
+              only the values read and their index (see Field), out is not used
+
+        Only the selected components and entities are read in the MED file,
+        the field values of the other entities are set to 0.
+
+        Returns
+        -----------
+        output : Field
+              the field, its components are the selected ones
+        """
         field_support, mesh_support  = self._get_field_support(field_id, time, ite)
 
-        if mesh_support in self.__readed_meshes.keys():
-            mesh = self.__readed_meshes[mesh_support]
+        ## the field is defined on the mesh iteration of the step
+        mesh_it = self._get_step_mesh_iteration(field_id, time)
+        mesh = self.__cache.get(("MESH", mesh_support, self._get_mesh_iden(mesh_support, mesh_it)))
+        if mesh is None:
+            mesh = self.read_mesh(mesh_support, mesh_it)
+
+        if group is not None:
+            if field_support == "NODES" and group in mesh.NODE_GROUPS:
+                entities = mesh.NODE_GROUPS[group]
+            elif group not in mesh.GROUPS:
+                _LOGGER.error("The group {} doesn't exist in mesh {}".format(group, mesh_support))
+                sys.exit(2)
+            elif field_support == "NODES":
+                entities = mesh.get_elements_nodes(mesh.GROUPS[group])
+            else:
+                entities = mesh.GROUPS[group]
+
+        _, val, components, profil, index = self.read_field_values(field_id, time, ite, components, entities)
+
+        ngauss = None
+        if field_support == "GAUSS":
+            ## the elements types without values have one (null) Gauss point
+            ngauss = dict((e_type, 1) for e_type in mesh.ELEMS.keys())
+            ngauss.update(self.get_gauss_points(field_id, time))
+
+        if sparse and index is not None:
+            res = Field(field_id, components, field_support, mesh, ngauss=ngauss, index=index, dtype=val.dtype)
+            if field_support == "GAUSS":
+                res[:, :val.shape[1]] = val
+            else:
+                res[:] = val
+        elif out is None and index is None:
+            ## the values read are used without copy, a read-only view in mmap mode
+            res = Field(field_id, components, field_support, mesh, values=val)
         else:
-            mesh = self.read_mesh(mesh_support)
-            #mesh = None
-            
+            ## the field keeps the type of the values stored in the file
+            res = Field(field_id, components, field_support, mesh, values=out, ngauss=ngauss, dtype=val.dtype)
+            if index is not None:
+                if out is not None:
+                    res[:] = 0.
+                if field_support == "GAUSS":
+                    res[index, :val.shape[1]] = val
+                else:
+                    res[index] = val
+            else:
+                res[:] = val
+        res.PROFILS = profil 
+        return res
+
+    def read_field_values(self, field_id, time, ite, components=None, entities=None):
+        """
+        Method which read the values of one time step of a given field, without
+        reading the mesh nor building a Field object
+
+        Parameters
+        -----------
+        field_id : string
+              the name of the field to read
+        time : int
+              the time step to read
+        ite : int
+              the iteration to read
+        components : list of string optional
+              the names of the components to read, all if None
+        entities : ndarray optional
+              the nodes, or elements, index to read
+
+        Returns
+        -----------
+        output : tuple (support, values, components, profil, index)
+              the field support, the values read (n, n_components), the components
+              names, the profil and the nodes/elements index of the values
+              (None if the values are defined on all nodes)
+        """
+        field_support, _ = self._get_field_support(field_id, time, ite)
+        comp_index = None
+        if components is not None:
+            comp_index = self._get_components_index(field_id, components)
+        if entities is not None:
+            entities = np.unique(np.asarray(entities, dtype=np.int64))
 
         if field_support == "NODES":
-            val, components, profil = self._read_nodal_field(field_id, time, ite)
+            val, components, profil, index = self._read_nodal_field(field_id, time, ite, comp_index, entities)
         elif field_support=="ELEMS":
-            val, components, profil = self._read_elem_field(field_id, time, ite)
+            val, components, profil, index = self._read_elem_field(field_id, time, ite, comp_index, entities)
         elif field_support=="GAUSS":
-            val, components, profil = self._read_gauss_field(field_id, time, ite)
-
-        res = Field(field_id, components, field_support, mesh) 
-        res.PROFILS = profil 
-        if profil is not None:
-            res[list(profil.values())[0]] = val
-        else:
-            res[:] = val
-        return res
+            val, components, profil, index = self._read_gauss_field(field_id, time, ite, comp_index, entities)
+        return field_support, val, components, profil, index
 
     def _get_field_support(self, field_id, time, ite):
+        if self.__metadata is not None:
+            ## the support of the first step, as in the index
+            field = self.__metadata["fields"][field_id]
+            return field["support"], field["mesh"]
         grp_sol = self.med_root['/CHA/'][field_id]
         mesh_support = grp_sol.attrs['MAI']
+        if isinstance(mesh_support, bytes):
+            mesh_support = mesh_support.decode()
         if time is None:
-            time = list(grp_sol.keys())[0]
+            grp_sol_t = grp_sol[list(grp_sol.keys())[0]]
         else:
-            time ="%.20d%.20d"%(time, time)
-        grp_sol_t = grp_sol[time]
+            grp_sol_t = self._get_step_group(field_id, time)
         sub_key = list(grp_sol_t.keys())[0]
         if "NOE" in sub_key:
             return "NODES", mesh_support
         elif "MAI" in sub_key:
+            for e_type in grp_sol_t.keys():
+                for profil_name in grp_sol_t[e_type].keys():
+                    if _is_gauss(grp_sol_t[e_type][profil_name].attrs):
+                        return "GAUSS", mesh_support
             return "ELEMS", mesh_support
 
     def _get_field_components(self, field_id):
+        if self.__metadata is not None:
+            return list(self.__metadata["fields"][field_id]["components"])
         grp_sol = self.med_root['/CHA/'][field_id]
         N_COMPO = grp_sol.attrs["NCO"]
         
@@ -353,8 +1049,71 @@ class MEDReader(object):
         components = [ comp_crude[(i*16):(i+1)*16].strip().decode('utf-8') for i in range(N_COMPO)]
         return components
 
+    def _get_components_index(self, field_id, components):
+        field_components = self._get_field_components(field_id)
+        comp_index = []
+        for comp in components:
+            if comp not in field_components:
+                _LOGGER.error("The field {} has no component {}".format(field_id, comp))
+                sys.exit(2)
+            comp_index.append(field_components.index(comp))
+        return comp_index
+
+    def _read_co(self, dataset, nbr, comp_index=None, pos=None):
+        """
+        Method which reads a CO dataset, stored component by component, and
+        returns the values as an array (n, n_components). Only the components
+        comp_index and the entries pos (increasing) are read in the file : one
+        hyperslab per component when the entries are close enough, a point
+        selection otherwise.
+        """
+        if self.__swmr:
+            ## the values of a reserved step are written in place
+            dataset.refresh()
+        if comp_index is None and pos is None:
+            return self._get_array(dataset).reshape((-1, nbr)).T
+        mapped = self._map_dataset(dataset)
+        if mapped is not None:
+            dataset = mapped
+        if comp_index is None:
+            comp_index = range(dataset.shape[0]//nbr)
+        n = nbr if pos is None else pos.shape[0]
+        res = np.empty((n, len(comp_index)), dtype=dataset.dtype)
+        if n == 0:
+            return res
+        for j, c in enumerate(comp_index):
+            start = c*nbr
+            if pos is None:
+                res[:,j] = dataset[start:start+nbr]
+            elif pos[-1] - pos[0] < 4*n:
+                res[:,j] = dataset[start+pos[0]:start+pos[-1]+1][pos-pos[0]]
+            else:
+                res[:,j] = dataset[start+pos]
+        return res
+
+    def _select_entries(self, index, entities, key=None):
+        """
+        Return the positions, in increasing order, of the entities in index
+        and the corresponding entities. If key identifies index (mesh, entity
+        type, profile...) the result is cached, the steps of a field sharing
+        their profiles share it (see read_history).
+        """
+        if key is not None:
+            key = ("ENTRIES",) + key + (entities.shape[0], hash(entities.tobytes()))
+            res = self.__cache.get(key)
+            if res is not None:
+                return res
+        selected, pos, _ = np.intersect1d(index, entities, assume_unique=True, return_indices=True)
+        order = np.argsort(pos)
+        res = pos[order], selected[order]
+        if key is not None:
+            for array in res:
+                array.setflags(write=False)
+            self.__cache.put(key, res)
+        return res
+
 
-    def _read_nodal_field(self, field_id, time, ite):
+    def _read_nodal_field(self, field_id, time, ite, comp_index=None, entities=None):
         """
         Method which read a nodal field in the med file
 
@@ -366,34 +1125,48 @@ class MEDReader(object):
               the time step to read
         iter : int
               the iteration to read
+        comp_index : list of int optional
+              the index of the components to read
+        entities : ndarray optional
+              the sorted index of the nodes to read
 
         Returns 
         -----------
-        output : Field object 
-              the require field in a Field object
+        output : tuple (values, components, profil, index)
+              the values read (n, n_components), the components names, the profil
+              and the nodes index of the values (None if all nodes are read)
         """ 
-        grp_sol = self.med_root['/CHA/'][field_id]
-        N_COMPO = grp_sol.attrs["NCO"]
-        
-        comp_crude = grp_sol.attrs["NOM"]
-        components = [ comp_crude[(i*16):(i+1)*16].strip().decode('utf-8') for i in range(N_COMPO)]
+        components = self._get_field_components(field_id)
+        if comp_index is not None:
+            components = [components[c] for c in comp_index]
 
-        field_time = grp_sol["%.20d%.20d"%(time, time)]['NOE']
+        field_time = self._get_step_group(field_id, time)['NOE']
         profil_name = field_time.attrs['PFL'].decode("utf-8")
         if profil_name != "MED_NO_PROFILE_INTERNAL":
             profil = self.__read_profile(profil_name)
+            index = profil[profil_name]
         else:
             profil = None
+            index = None
 
         key = list(field_time.keys())[0]
         grp_sol_t = field_time[key]
         NBR = grp_sol_t.attrs['NBR']
-        field_crude = grp_sol_t['CO'][:]
-        field = field_crude.reshape((N_COMPO,-1)).T
-        return field, components, profil
+        pos = None
+        if entities is not None:
+            if index is None:
+                pos = entities[entities < NBR]
+                index = pos
+            else:
+                mesh_support = self.med_root['/CHA/'][field_id].attrs["MAI"]
+                if isinstance(mesh_support, bytes):
+                    mesh_support = mesh_support.decode()
+                pos, index = self._select_entries(index, entities, (mesh_support, "NOE", profil_name))
+        field = self._read_co(grp_sol_t['CO'], NBR, comp_index, pos)
+        return field, components, profil, index
 
 
-    def _read_elem_field(self, field_id, time, ite):
+    def _read_elem_field(self, field_id, time, ite, comp_index=None, entities=None, gauss=False):
         """
         Method which read an element level field in the med file
 
@@ -405,46 +1178,85 @@ class MEDReader(object):
               the time step to read
         iter : int
               the iteration to read
+        comp_index : list of int optional
+              the index of the components to read
+        entities : ndarray optional
+              the sorted index of the elements to read
+        gauss : bool optional
+              if True the values are read at the Gauss points of the elements
 
         Returns 
         -----------
-        output : ndarray 
-              the require field in a numpy ndarray format with the size (Nelements , Ncomponents)
+        output : tuple (values, components, profil, index)
+              the values read (n, n_components), or (n, n_gauss_max, n_components)
+              for a Gauss points field, the components names, the profil and the
+              elements index of the values
         """ 
         grp_sol = self.med_root['/CHA/'][field_id]
         SUPPORT = grp_sol.attrs["MAI"]
-        ### Read mesh information
-        _, _, ELEM_BY_TYPES, _ = self._read_elem_data(SUPPORT)
+        if isinstance(SUPPORT, bytes):
+            SUPPORT = SUPPORT.decode()
         
-        N_COMPO = grp_sol.attrs["NCO"]
-        comp_crude = grp_sol.attrs["NOM"]
-        components = [ comp_crude[(i*16):(i+1)*16].strip().decode('utf-8') for i in range(N_COMPO)]
-        grp_sol_t = grp_sol["%.20d%.20d"%(time, time)]
-        types_elem_list = grp_sol_t.keys()
-        ### loop one to count total number of elements
-        NE = 0
-        for e_type in types_elem_list:
-            profil_name = grp_sol_t[e_type].attrs['PFL'].decode("utf-8")
-            NE += grp_sol_t[e_type+'/'+profil_name].attrs['NBR']
-            
-        field = np.zeros((NE, N_COMPO))
+        components = self._get_field_components(field_id)
+        if comp_index is not None:
+            components = [components[c] for c in comp_index]
+        grp_sol_t = self._get_step_group(field_id, time)
+        ### Read mesh information, the mesh iteration is given by RDT/ROR
+        mesh_it = self._get_step_mesh_iteration(field_id, time)
+        topology = self.get_topology(SUPPORT, mesh_it)
+
+        values = []
+        indices = []
         profils = {}
-        for e_type in types_elem_list:
+        for e_type in grp_sol_t.keys():
             profil_name = grp_sol_t[e_type].attrs['PFL'].decode("utf-8")
+            elems = topology.ELEMS[e_type.split('.')[1]]
+            if isinstance(elems, slice):
+                elems = np.arange(elems.start, elems.stop)
             if profil_name != "MED_NO_PROFILE_INTERNAL":
+                ## profile index are relative to the elements of the type
                 profil_e = self.__read_profile(profil_name)
-                profils.update(profile_e)
-                index = profie_e[profil_name]
+                index = elems[profil_e[profil_name]]
+                profils[profil_name] = index
             else:
-                profils = None
-                list_elem = ELEM_BY_TYPES[self.__translator[e_type.split('.')[1]]['id']]
-                index = list_elem
-                
-            field_on_type = grp_sol_t[e_type+'/'+profil_name+'/CO'][:].reshape((N_COMPO,-1)).T
-            field[index, :] = field_on_type
-        return field, components, profils
+                index = elems
+            grp_4 = grp_sol_t[e_type+'/'+profil_name]
+            pos = None
+            if entities is not None:
+                pos, index = self._select_entries(index, entities, (SUPPORT, mesh_it, e_type, profil_name))
+                if pos.shape[0] == 0:
+                    continue
+            if gauss:
+                ## the values of the Gauss points of an element are contiguous
+                n_g = int(grp_4.attrs['NGA'])
+                if pos is not None:
+                    pos = (pos[:, None]*n_g + np.arange(n_g)).ravel()
+                val = self._read_co(grp_4['CO'], grp_4.attrs['NBR']*n_g, comp_index, pos)
+                values.append(val.reshape(-1, n_g, val.shape[1]))
+            else:
+                values.append(self._read_co(grp_4['CO'], grp_4.attrs['NBR'], comp_index, pos))
+            indices.append(index)
+
+        if len(values) == 0:
+            field = np.zeros((0, 1, len(components)) if gauss else (0, len(components)))
+            index = np.zeros(0, dtype=np.int64)
+        elif gauss:
+            ## elements with less Gauss points are padded with zeros
+            n_g = max(val.shape[1] for val in values)
+            field = np.zeros((sum(val.shape[0] for val in values), n_g, len(components)), dtype=np.result_type(*values))
+            start = 0
+            for val in values:
+                field[start:start+val.shape[0], :val.shape[1]] = val
+                start += val.shape[0]
+            index = np.concatenate(indices)
+        else:
+            field = np.concatenate(values, axis=0)
+            index = np.concatenate(indices)
+        if len(profils) == 0:
+            profils = None
+        return field, components, profils, index
     
-    def _read_gauss_field(self, field_id, time, ite):
+    def _read_gauss_field(self, field_id, time, ite, comp_index=None, entities=None):
         """
         Method which read a Gaussian nodes level field in the med file
 
@@ -456,20 +1268,69 @@ class MEDReader(object):
               the time step to read
         iter : int
               the iteration to read
+        comp_index : list of int optional
+              the index of the components to read
+        entities : ndarray optional
+              the sorted index of the elements to read
 
         Returns 
         -----------
-        output : ndarray 
-              the require field in a numpy ndarray format with the size (Nelem, NGaussPoints , Ncomponents)
+        output : tuple (values, components, profil, index)
+              the values read (n, n_gauss_max, n_components), the components names,
+              the profil and the elements index of the values
         """ 
-        return NotImplementedError
+        return self._read_elem_field(field_id, time, ite, comp_index, entities, gauss=True)
 
-    def __read_profile(self, profil_name):
-        profil_name = profil_name.decode()
-        profil_grp = self.med_root['/PROFILS/'+profil_name]
-        nbr = profil_grp.attrs['NBR']
+    def get_gauss_points(self, field_id, time):
+        """
+        Method which returns the number of Gauss points of each elements type of
+        a Gauss points field at a given time step
+
+        Returns 
+        -----------
+        output : dict
+              {type_id : number of Gauss points}
+        """
+        grp_sol_t = self._get_step_group(field_id, time)
+        ngauss = {}
+        for e_type in grp_sol_t.keys():
+            med_type = e_type.split('.')[1]
+            for profil_name in grp_sol_t[e_type].keys():
+                ngauss[self.__translator[med_type]['id']] = int(grp_sol_t[e_type][profil_name].attrs['NGA'])
+        return ngauss
+
+    def get_gauss_localizations(self):
+        """
+        Method which read the Gauss points localizations of the med file
+
+        Returns 
+        -----------
+        output : dict
+              {name : {"type", "ref", "gauss", "weights"}} with the reference
+              element nodes coordinates, the Gauss points coordinates and weights
+        """
+        res = {}
+        if 'GAUSS' not in self.med_root:
+            return res
+        for name, grp in self.med_root['GAUSS'].items():
+            dim = int(grp.attrs['DIM'])
+            geo = int(grp.attrs['GEO'])
+            med_type = [key for key, val in _MED2MED.items() if int(val['geo']) == geo]
+            res[name] = {"type": med_type[0] if len(med_type) > 0 else geo,
+                         "ref": grp['COO'][:].reshape(-1, dim),
+                         "gauss": grp['GAU'][:].reshape(-1, dim),
+                         "weights": grp['VAL'][:]}
+        return res
 
-        index = profil_grp['PFL'][:] -1    ## Numerotation begin to 1
+    def __read_profile(self, profil_name):
+        if isinstance(profil_name, bytes):
+            profil_name = profil_name.decode()
+        ## a profile is never modified once written, it is read once
+        index = self.__cache.get(("PROFILE", profil_name))
+        if index is None:
+            index = self.med_root['/PROFILS/'+profil_name]['PFL'][:] -1    ## Numerotation begin to 1
+            index.setflags(write=False)
+            self.__cache.put(("PROFILE", profil_name), index)
         res = {profil_name: index}
         return res
 
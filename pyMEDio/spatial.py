@@ -0,0 +1,415 @@
+#==============================================================================
+# Copyright (C) 2016 Marchand Basile
+#
+# This file is part of pyMEDio
+#
+# pyMEDio is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# pyMEDio is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with pyPointer.  If not, see <http://www.gnu.org/licenses/>
+#==============================================================================
+#----------------------------------
+# package    : pyMEDio
+# file       : spatial.py
+# content    : Spatial index of a mesh, nearest nodes and points location
+# author     : Basile Marchand (basile.marchand@gmail.com)
+# date       : 17-07-2016
+#----------------------------------
+
+import itertools
+import logging
+import numpy as np
+from .elem_translation import _MED2MED, _VTK2MED
+
+_LOGGER = logging.getLogger('pyMEDio.spatial')
+
+## Elements types which can be located, in MED syntax
+_LOCATED_TYPES = ("TR3", "QU4", "TE4")
+
+## Number of (point, cell) pairs built at once by the queries
+_CHUNK_PAIRS = 2**21
+
+
+def _as_3d(coor):
+    ## the coordinates of 1D and 2D meshes may have less than 3 columns
+    coor = np.asarray(coor, dtype=np.float64)
+    if coor.ndim == 2 and coor.shape[1] < 3:
+        coor = np.concatenate((coor, np.zeros((coor.shape[0], 3-coor.shape[1]))), axis=1)
+    return coor.reshape(-1, 3)
+
+
+def _med_type(type_id):
+    ## element type ids are given in MED or VTK syntax
+    if type_id in _MED2MED:
+        return type_id
+    if type_id in _VTK2MED:
+        return _VTK2MED[type_id]['id']
+    return None
+
+
+class _Grid(object):
+    """
+    Uniform grid over a box, items are stored by cell in CSR layout
+    """
+
+    def __init__(self, lower, upper, h):
+        extent = upper - lower
+        self.ACTIVE = extent > 1e-12*max(extent.max(), 1e-300)
+        self.LOWER = lower
+        self.H = np.where(self.ACTIVE, h, max(extent.max(), 1.))
+        self.SHAPE = np.where(self.ACTIVE, np.maximum(np.ceil(extent/self.H), 1), 1).astype(np.int64)
+        self.NCELLS = int(np.prod(self.SHAPE))
+        self.ORDER = None
+        self.START = None
+        self.EMPTY = None
+
+    def cells(self, points):
+        ## cells of the points, the points out of the grid are in the border cells
+        ijk = np.floor((points - self.LOWER) / self.H).astype(np.int64)
+        return np.clip(ijk, 0, self.SHAPE-1)
+
+    def keys(self, ijk):
+        return (ijk[:, 0]*self.SHAPE[1] + ijk[:, 1])*self.SHAPE[2] + ijk[:, 2]
+
+    def fill(self, keys, items):
+        order = np.argsort(keys, kind='stable')
+        self.ORDER = items[order]
+        self.START = np.zeros(self.NCELLS+1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=self.NCELLS), out=self.START[1:])
+
+    def candidates(self, keys):
+        """
+        Return the pairs (i, item) of the items of the cells keys[i]
+        """
+        cnt = self.START[keys+1] - self.START[keys]
+        i = np.repeat(np.arange(keys.shape[0]), cnt)
+        pos = np.repeat(self.START[keys] - np.cumsum(cnt) + cnt, cnt) + np.arange(i.shape[0])
+        return i, self.ORDER[pos]
+
+    def neighbours(self, cells, sel, offsets, points=None, bound=None):
+        """
+        Iterate on the pairs (point, item) of the items of the cells cells[sel] + offsets,
+        if bound is given the cells farther than bound[point] of points[point] are skipped
+        """
+        keep = np.ones((sel.shape[0], offsets.shape[0]), dtype=bool)
+        keys = np.zeros((sel.shape[0], offsets.shape[0]), dtype=np.int64)
+        gap = np.zeros((sel.shape[0], offsets.shape[0]))
+        for d in range(3):
+            nb = cells[sel, d][:, None] + offsets[:, d]
+            keep &= (nb >= 0) & (nb < self.SHAPE[d])
+            keys *= self.SHAPE[d]
+            keys += nb
+            if bound is not None:
+                ## distance of the point to the cell, in this direction
+                x = points[sel, d][:, None] - (self.LOWER[d] + nb*self.H[d])
+                gap += np.maximum(np.maximum(-x, x - self.H[d]), 0.)**2
+        if bound is not None:
+            keep &= gap <= bound[sel][:, None]**2
+        point, off = np.nonzero(keep)
+        keys = keys[point, off]
+        ## empty cells are dropped first
+        full = self.START[keys+1] != self.START[keys]
+        point, keys = sel[point[full]], keys[full]
+        ## bounded memory : the pairs are built by chunks of cells
+        count = np.cumsum(self.START[keys+1] - self.START[keys])
+        first = 0
+        while first < keys.shape[0]:
+            last = max(first+1, int(np.searchsorted(count, count[first] + _CHUNK_PAIRS)))
+            i, items = self.candidates(keys[first:last])
+            yield point[first:last][i], items
+            first = last
+
+    def empty_distance(self, max_distance=8):
+        """
+        Compute EMPTY, for each cell the distance (infinite norm, in cells) to
+        the nearest non empty cell, bounded by max_distance
+        """
+        full = (np.diff(self.START) != 0).reshape(self.SHAPE)
+        dist = np.where(full, 0, max_distance).astype(np.int8)
+        reached = full.copy()
+        for k in range(1, max_distance):
+            ## the successive dilations in the three directions give the 26 neighbours
+            grown = reached
+            for d in range(3):
+                if self.SHAPE[d] > 1:
+                    lo = [slice(None)]*3
+                    hi = [slice(None)]*3
+                    lo[d], hi[d] = slice(0, -1), slice(1, None)
+                    previous = grown
+                    grown = previous.copy()
+                    grown[tuple(lo)] |= previous[tuple(hi)]
+                    grown[tuple(hi)] |= previous[tuple(lo)]
+            dist[grown & ~reached] = k
+            reached = grown
+            if reached.all():
+                break
+        self.EMPTY = dist.ravel()
+
+    def margin(self, points, cells, r):
+        """
+        Return the distance of the points to the outside of the cube of cells at
+        a distance lower or equal to r, the sides out of the grid are ignored
+        """
+        lo = cells - r[:, None]
+        hi = cells + r[:, None] + 1
+        margin = np.full(points.shape[0], np.inf)
+        for d in range(3):
+            low_side = points[:, d] - (self.LOWER[d] + lo[:, d]*self.H[d])
+            high_side = self.LOWER[d] + hi[:, d]*self.H[d] - points[:, d]
+            margin = np.where(lo[:, d] > 0, np.minimum(margin, low_side), margin)
+            margin = np.where(hi[:, d] < self.SHAPE[d], np.minimum(margin, high_side), margin)
+        return margin
+
+    def ring(self, r):
+        ## cells offsets at the distance r (infinite norm) in the active directions
+        ranges = [range(-r, r+1) if active else (0,) for active in self.ACTIVE]
+        offsets = [off for off in itertools.product(*ranges) if max([abs(o) for o in off]) == r]
+        return np.array(offsets, dtype=np.int64).reshape(-1, 3)
+
+
+class SpatialIndex(object):
+    """
+    Spatial index of a mesh, built from its coordinates and connectivity
+
+    Nodes and elements bounding boxes are hashed on uniform grids, the grids are
+    built at the first query. The TR3, QU4 and TE4 elements can be located, the
+    element types ids must be in MED or VTK syntax.
+    """
+
+    def __init__(self, mesh):
+        self.MESH = mesh
+        self.__coor = _as_3d(mesh.COOR)
+        self.__nodes_grid = None
+        self.__elems_grid = None
+
+    def __get_nodes_grid(self):
+        if self.__nodes_grid is None:
+            coor = self.__coor
+            lower, upper = coor.min(axis=0), coor.max(axis=0)
+            extent = upper - lower
+            active = extent > 1e-12*max(extent.max(), 1e-300)
+            ## about two nodes per cell
+            h = 1.
+            if np.any(active):
+                h = (2.*np.prod(extent[active]) / coor.shape[0])**(1./np.count_nonzero(active))
+            grid = _Grid(lower, upper, h)
+            grid.fill(grid.keys(grid.cells(coor)), np.arange(coor.shape[0]))
+            grid.empty_distance()
+            self.__nodes_grid = grid
+        return self.__nodes_grid
+
+    def __get_elems_grid(self):
+        if self.__elems_grid is None:
+            mesh = self.MESH
+            codes = [code for code, type_id in enumerate(mesh.TYPE_IDS) if _med_type(type_id) in _LOCATED_TYPES]
+            elems = np.flatnonzero(np.isin(mesh.TYPES, codes))
+            coor = self.__coor[mesh.NODES]
+            self.__lower = np.minimum.reduceat(coor, mesh.OFFSETS[:-1], axis=0)
+            self.__upper = np.maximum.reduceat(coor, mesh.OFFSETS[:-1], axis=0)
+            lower, upper = self.__lower[elems], self.__upper[elems]
+            box_lower, box_upper = self.__coor.min(axis=0), self.__coor.max(axis=0)
+            extent = box_upper - box_lower
+            active = extent > 1e-12*max(extent.max(), 1e-300)
+            ## cells of the size of the elements, without too much cells
+            h = 1.
+            if np.any(active) and elems.shape[0] != 0:
+                h = np.median((upper - lower)[:, active].max(axis=1))
+                h = max(h, (np.prod(extent[active]) / (8.*elems.shape[0]))**(1./np.count_nonzero(active)))
+            grid = _Grid(box_lower, box_upper, h)
+            ## an element is stored in all the cells of its bounding box
+            lo, hi = grid.cells(lower), grid.cells(upper)
+            span = hi - lo + 1
+            total = np.prod(span, axis=1)
+            rep = np.repeat(np.arange(elems.shape[0]), total)
+            local = np.arange(rep.shape[0]) - np.repeat(np.cumsum(total) - total, total)
+            ijk = np.empty((rep.shape[0], 3), dtype=np.int64)
+            ijk[:, 2] = lo[rep, 2] + local % span[rep, 2]
+            local //= span[rep, 2]
+            ijk[:, 1] = lo[rep, 1] + local % span[rep, 1]
+            ijk[:, 0] = lo[rep, 0] + local // span[rep, 1]
+            grid.fill(grid.keys(ijk), elems[rep])
+            self.__elems_grid = grid
+        return self.__elems_grid
+
+    def nearest_nodes(self, points):
+        """
+        Method which finds the nearest node of each point
+
+        Parameters
+        -----------
+        points : ndarray
+            the points coordinates, array of size (n, 3), or (n, 2) for a 2D mesh
+
+        Returns
+        -----------
+        output : tuple (nodes, distances)
+            the index of the nearest node of each point and its distance
+        """
+        points = _as_3d(points)
+        grid = self.__get_nodes_grid()
+        coor = self.__coor
+        best_d = np.full(points.shape[0], np.inf)
+        best_n = np.full(points.shape[0], -1, dtype=np.int64)
+        todo = np.arange(points.shape[0])
+        cells = grid.cells(points)
+        ## the cells are searched by rings of increasing distance, from the first
+        ## ring which may contain nodes
+        ring = grid.EMPTY[grid.keys(cells)].astype(np.int64)
+        while todo.shape[0] != 0:
+            for r in np.unique(ring[todo]).tolist():
+                offsets = grid.ring(r)
+                sel = todo[ring[todo] == r]
+                ## bounded memory : the pairs (point, cell) are built by chunks
+                step = max(1, _CHUNK_PAIRS // offsets.shape[0])
+                for start in range(0, sel.shape[0], step):
+                    for query, nodes in grid.neighbours(cells, sel[start:start+step], offsets, points, best_d):
+                        dist = np.linalg.norm(points[query] - coor[nodes], axis=1)
+                        np.minimum.at(best_d, query, dist)
+                        best = dist == best_d[query]
+                        best_n[query[best]] = nodes[best]
+            ## a point is solved when its nearest node is closer than the cells
+            ## out of the searched cube, there is no node out of the grid
+            todo = todo[best_d[todo] > grid.margin(points[todo], cells[todo], ring[todo])]
+            ring[todo] += 1
+        return best_n, best_d
+
+    def locate_points(self, points, tol=1e-6):
+        """
+        Method which finds the element containing each point, and the
+        barycentric (shape functions) weights of the point in the element
+
+        Parameters
+        -----------
+        points : ndarray
+            the points coordinates, array of size (n, 3), or (n, 2) for a 2D mesh
+        tol : float, default 1e-6
+            relative tolerance of the inside test
+
+        Returns
+        -----------
+        output : tuple (elements, nodes, weights)
+            elements : (n,) the element containing each point, -1 if not found
+            nodes    : (n, 4) the nodes of the element, -1 padded
+            weights  : (n, 4) the weights of the nodes, 0 padded
+        """
+        points = _as_3d(points)
+        mesh = self.MESH
+        grid = self.__get_elems_grid()
+        n = points.shape[0]
+        elements = np.full(n, -1, dtype=np.int64)
+        nodes = np.full((n, 4), -1, dtype=np.int64)
+        weights = np.zeros((n, 4))
+        if grid.ORDER.shape[0] == 0:
+            return elements, nodes, weights
+
+        cells = grid.cells(points)
+        score = np.full(n, -np.inf)
+        zero = np.zeros((1, 3), dtype=np.int64)
+        step = max(1, _CHUNK_PAIRS // max(1, int(np.diff(grid.START).mean())))
+        for start in range(0, n, step):
+            for query, elems in grid.neighbours(cells, np.arange(start, min(n, start+step)), zero):
+                ## the elements whose bounding box contains the point
+                margin = tol*np.max(self.__upper[elems] - self.__lower[elems], axis=1)[:, None]
+                p = points[query]
+                inbox = np.all((p >= self.__lower[elems] - margin) & (p <= self.__upper[elems] + margin), axis=1)
+                self.__locate_candidates(points, query[inbox], elems[inbox], tol, elements, weights, score)
+
+        found = np.flatnonzero(elements >= 0)
+        sizes = mesh.OFFSETS[elements[found]+1] - mesh.OFFSETS[elements[found]]
+        for k in range(4):
+            has_k = sizes > k
+            nodes[found[has_k], k] = mesh.NODES[mesh.OFFSETS[elements[found[has_k]]] + k]
+        return elements, nodes, weights
+
+    def __locate_candidates(self, points, query, elems, tol, elements, weights, score):
+        ## test the pairs (point, element), the element where the point is the
+        ## most inside is kept
+        mesh = self.MESH
+        pair_weights = np.zeros((query.shape[0], 4))
+        pair_score = np.full(query.shape[0], -np.inf)
+        for code, type_id in enumerate(mesh.TYPE_IDS):
+            med_type = _med_type(type_id)
+            if med_type not in _LOCATED_TYPES:
+                continue
+            sel = np.flatnonzero(mesh.TYPES[elems] == code)
+            if sel.shape[0] == 0:
+                continue
+            nn = _MED2MED[med_type]["nn"]
+            e_nodes = mesh.NODES[mesh.OFFSETS[elems[sel]][:, None] + np.arange(nn)]
+            x = self.__coor[e_nodes]
+            p = points[query[sel]]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if med_type == "TE4":
+                    w, inside = _tetra_weights(x, p, tol)
+                elif med_type == "TR3":
+                    w, inside = _triangle_weights(x, p, tol)
+                else:
+                    w, inside = _quad_weights(x, p, tol)
+            pair_weights[sel, :nn] = w
+            pair_score[sel] = np.where(inside, np.min(w, axis=1), -np.inf)
+
+        np.maximum.at(score, query, pair_score)
+        best = np.isfinite(pair_score) & (pair_score == score[query])
+        elements[query[best]] = elems[best]
+        weights[query[best]] = pair_weights[best]
+
+
+def _tetra_weights(x, p, tol):
+    a = x[:, 0]
+    u, v, w, q = x[:, 1] - a, x[:, 2] - a, x[:, 3] - a, p - a
+    det = np.einsum('ij,ij->i', u, np.cross(v, w))
+    l1 = np.einsum('ij,ij->i', q, np.cross(v, w)) / det
+    l2 = np.einsum('ij,ij->i', u, np.cross(q, w)) / det
+    l3 = np.einsum('ij,ij->i', u, np.cross(v, q)) / det
+    weights = np.stack((1. - l1 - l2 - l3, l1, l2, l3), axis=1)
+    return weights, np.all(weights >= -tol, axis=1)
+
+
+def _triangle_weights(x, p, tol):
+    a = x[:, 0]
+    u, v, q = x[:, 1] - a, x[:, 2] - a, p - a
+    d00 = np.einsum('ij,ij->i', u, u)
+    d01 = np.einsum('ij,ij->i', u, v)
+    d11 = np.einsum('ij,ij->i', v, v)
+    d20 = np.einsum('ij,ij->i', q, u)
+    d21 = np.einsum('ij,ij->i', q, v)
+    den = d00*d11 - d01*d01
+    l1 = (d11*d20 - d01*d21) / den
+    l2 = (d00*d21 - d01*d20) / den
+    weights = np.stack((1. - l1 - l2, l1, l2), axis=1)
+    ## the point must be in the triangle plane
+    dist = np.linalg.norm(q - l1[:, None]*u - l2[:, None]*v, axis=1)
+    size = np.sqrt(np.maximum(d00, d11))
+    return weights, np.all(weights >= -tol, axis=1) & (dist <= tol*size)
+
+
+def _quad_weights(x, p, tol):
+    ## bilinear mapping inverted by Newton iterations, in the least square sense
+    ## for a warped or 3D quadrangle
+    xi = np.array([-1., 1., 1., -1.])
+    eta = np.array([-1., -1., 1., 1.])
+    s = np.zeros((p.shape[0], 2))
+    for _ in range(10):
+        shape = 0.25*(1. + s[:, :1]*xi)*(1. + s[:, 1:]*eta)
+        d_xi = 0.25*xi*(1. + s[:, 1:]*eta)
+        d_eta = 0.25*eta*(1. + s[:, :1]*xi)
+        res = p - np.einsum('ik,ikj->ij', shape, x)
+        jac = np.stack((np.einsum('ik,ikj->ij', d_xi, x), np.einsum('ik,ikj->ij', d_eta, x)), axis=2)
+        jtj = np.einsum('ijk,ijl->ikl', jac, jac)
+        jtr = np.einsum('ijk,ij->ik', jac, res)
+        det = jtj[:, 0, 0]*jtj[:, 1, 1] - jtj[:, 0, 1]*jtj[:, 1, 0]
+        s[:, 0] += (jtj[:, 1, 1]*jtr[:, 0] - jtj[:, 0, 1]*jtr[:, 1]) / det
+        s[:, 1] += (jtj[:, 0, 0]*jtr[:, 1] - jtj[:, 1, 0]*jtr[:, 0]) / det
+    weights = 0.25*(1. + s[:, :1]*xi)*(1. + s[:, 1:]*eta)
+    dist = np.linalg.norm(p - np.einsum('ik,ikj->ij', weights, x), axis=1)
+    size = np.linalg.norm(x[:, 2] - x[:, 0], axis=1)
+    inside = np.all(np.abs(s) <= 1. + tol, axis=1) & (dist <= tol*size)
+    return weights, inside
@@ -25,16 +25,74 @@
 #---------------------------------- 
 
 import os
+import sys
 import logging
 import numpy as np
 import h5py
 
-from .elem_translation import _VTK2MED, _MED2MED, _GMSH2MED
+from .elem_translation import _VTK2MED, _MED2MED, _GMSH2MED, _MED_GAUSS
+
+## Default chunk length, in values, of chunked datasets (512 kB of float64)
+_CHUNK_SIZE = 65536
+
+## Written steps of a field reserved for the SWMR mode, see reserve_field_steps
+_SWMR_STEP = np.dtype([('NDT', np.int32), ('PDT', np.float64)])
+
+
+def _to_str(value):
+    ## string attributes are read as bytes or str depending on their storage
+    if isinstance(value, bytes):
+        return value.decode()
+    return str(value)
 
 _LOGGER = logging.getLogger('pyMEDio.reader')
 
+def finalize_reserved_steps(med_file):
+    """
+    Remove the reserved steps not written (see MEDWriter.reserve_field_steps) of
+    a MED file written in SWMR mode, and the list of its written steps (/SWMR
+    group) : the file is then a plain MED file. The written steps have their
+    time values as soon as they are written, the steps not written are only
+    ignored by MEDReader, the other MED tools read them. MEDWriter.end() calls
+    it, it has to be called again once the readers are closed if the file was
+    still read.
+
+    Parameters
+    -----------
+    med_file : string
+         the path of the MED file
+
+    Returns
+    -----------
+    output : bool
+         False if the file can't be opened for writing (still read), True otherwise
+    """
+    ## the file locks don't protect a file still opened by a reader of this process
+    med_path = os.path.realpath(med_file)
+    for file_id in h5py.h5f.get_obj_ids(h5py.h5f.OBJ_ALL, h5py.h5f.OBJ_FILE):
+        if os.path.realpath(file_id.name.decode()) == med_path:
+            return False
+    try:
+        med_root = h5py.File(med_file, "a", libver="latest")
+    except (IOError, OSError):
+        return False
+    with med_root:
+        if "SWMR" not in med_root.keys():
+            return True
+        for field_name, progress in med_root['/SWMR'].items():
+            written = set(progress['NDT'].tolist())
+            f_group = med_root['/CHA/'+field_name]
+            for step_key in list(f_group.keys()):
+                if int(f_group[step_key].attrs['NDT']) not in written:
+                    del f_group[step_key]
+        del med_root['/SWMR']
+    return True
+
+
 class MEDWriter(object):
-    def __init__(self, med_file, input_format="MED"):
+    def __init__(self, med_file, input_format="MED", chunks=None, compression=None,
+                 compression_opts=None, shuffle=False, fletcher32=False, mode="w", flush=None,
+                 swmr=False, dtype=None):
         """
         MEDWriter __init__ method which create a new MED file or open an existing 
 
@@ -46,13 +104,108 @@ class MEDWriter(object):
         input_format : string {"MED", "VTK", "GMSH"} default "MED"
              the syntax used in the Mesh object we will write in the MED file
 
+        chunks : None, "auto", bool or int, default None
+             storage layout of the datasets (COO, NOD, NUM, FAM, PFL and fields CO) :
+             None (or False) for contiguous datasets, unless a filter is used, "auto"
+             (or True) for the default chunking and an int for the chunk length in values.
+             The default chunk length is 65536 values, reduced so that each
+             component of a CO dataset is cut in equal chunks : reading one
+             component, or a few entities, only decompresses a few chunks.
+
+        compression : None, "gzip" or "lzf", default None
+             the compression filter, "lzf" files can only be read with h5py,
+             not with the MED library
+
+        compression_opts : int, default None
+             the gzip compression level (0-9)
+
+        shuffle : bool, default False
+             use the shuffle filter, improves the compression of floats
+
+        fletcher32 : bool, default False
+             add a checksum to each chunk
+
+        mode : string {"w", "a"}, default "w"
+             "w" creates the MED file, overwritten if it already exists,
+             "a" opens an existing MED file (created if it doesn't exist) to
+             add meshes, fields and time steps to the ones already stored
+
+        flush : None or int, default None
+             flush policy : None lets HDF5 buffer the data until end(), an int n
+             flushes the file on disk every n written time steps (and after each
+             mesh), so that a transient computation can be written step by step
+
+        swmr : bool, default False
+             use the HDF5 single writer multiple readers mode : the file uses the
+             latest HDF5 format and MEDReader(swmr=True) can read it while it is
+             written. The SWMR mode doesn't allow to create HDF5 objects : the
+             meshes and the steps of the fields (see reserve_field_steps) are
+             written first, then start_swmr() is called and the reserved steps
+             are filled by write_field_at_time. Each step is flushed, unless an
+             other flush policy is given. The reserved steps not written are
+             removed by end(), see finalize_reserved_steps
+
+        dtype : None or numpy float dtype, default None
+             the type of the stored fields values and nodes coordinates, None keeps
+             the type of the written arrays, np.float32 halves the file size
         """
-        self.__med_root = h5py.File(med_file, "w")
-        self.__create_structure()
+        ## chunks=True is the default chunking, as "auto" (bool is a subclass of int)
+        if chunks is True or chunks == "auto":
+            chunks = _CHUNK_SIZE
+        elif chunks is False:
+            chunks = None
+        elif chunks is not None and (not isinstance(chunks, (int, np.integer)) or chunks <= 0):
+            _LOGGER.error('The chunks option {!r} is not avalaible, use None, "auto" or a positive int'.format(chunks))
+            sys.exit(1)
+        self.__storage = {"chunks": chunks, "compression": compression, "compression_opts": compression_opts,
+                          "shuffle": shuffle, "fletcher32": fletcher32}
+        ## profiles of the groups restricted fields, see __compute_profile
+        self.__profiles = {}
+        ## {profile name : stored PFL}, see __create_profil
+        self.__profil_contents = {}
+        ## {(elements type, number of Gauss points) : localization name}, see __create_localization
+        self.__localizations = {}
+        if swmr and flush is None:
+            flush = 1
+        self.__flush = flush
+        self.__unflushed = 0
+        self.__dtype = None if dtype is None else np.dtype(dtype)
+        self.__swmr = swmr
+        self.__swmr_mode = False
+        libver = "latest" if swmr else None
+        if mode == "w":
+            self.__med_root = h5py.File(med_file, "w", libver=libver)
+            self.__create_structure()
+        elif mode == "a":
+            if swmr and h5py.is_hdf5(med_file):
+                ## the superblock of the files created without libver="latest" doesn't allow SWMR
+                with h5py.File(med_file, "r") as med_root:
+                    superblock = med_root.id.get_create_plist().get_version()[0]
+                if superblock < 3:
+                    raise ValueError("The MED file {} doesn't use the latest HDF5 file format, required by "
+                                     "the SWMR mode : it must be created by MEDWriter(swmr=True) in 'w' mode, "
+                                     "or copied in a new file with h5py.File(..., libver='latest')".format(med_file))
+            try:
+                self.__med_root = h5py.File(med_file, "a", libver=libver)
+            except IOError:
+                _LOGGER.error("MED file {} can't be opened in append mode".format(med_file))
+                sys.exit(1)
+            self.__open_structure()
+        else:
+            _LOGGER.error('The writer mode {} is not avalaible'.format(mode))
+            sys.exit(1)
         
         self.__set_mesh_syntax(input_format)
 
 
+    def __stored_dtype(self, values):
+        ## type of the stored floats : the writer dtype or the type of the values
+        if self.__dtype is not None:
+            return self.__dtype
+        if values.dtype.kind == 'f':
+            return values.dtype
+        return np.dtype(np.float64)
+
     def __set_mesh_syntax(self, input_format):
         if input_format=="MED":
             self.__translator = _MED2MED
@@ -76,18 +229,149 @@ class MEDWriter(object):
         self.__med_root.create_group('FAS')
         self.__med_root.create_group('CHA')
         self.__med_root.create_group('GAUSS')
+
+    def __open_structure(self):
+        """
+        Method which checks the structure of a MED file opened in append mode,
+        the missing background groups are created (empty or new file)
+        """
+        if "INFOS_GENERALES" not in self.__med_root.keys():
+            if len(self.__med_root.keys()) != 0:
+                _LOGGER.error("File {} is not a MED file".format(self.__med_root.filename))
+                sys.exit(1)
+            self.__create_structure()
+            return None
+        for grp_name in ['ENS_MAA', 'FAS', 'CHA', 'GAUSS']:
+            if grp_name not in self.__med_root.keys():
+                self.__med_root.create_group(grp_name)
+        ## the stored localizations are used by the new Gauss points fields
+        geo_types = {int(val['geo']): key for key, val in _MED2MED.items()}
+        for name, grp in self.__med_root['/GAUSS'].items():
+            med_type = geo_types.get(int(grp.attrs['GEO']))
+            self.__localizations.setdefault((med_type, int(grp.attrs['NBR'])), name)
+        _LOGGER.info("MED file {} opened in append mode : {} meshes, {} fields".format(
+            self.__med_root.filename, len(self.get_meshes_names()), len(self.get_fields_names())))
+
+    def get_meshes_names(self):
+        """
+        Method which returns the names of the meshes stored in the MED file,
+        including the ones already present in a file opened in append mode
+        """
+        return list(self.__med_root['/ENS_MAA'].keys())
+
+    def get_fields_names(self):
+        """
+        Method which returns the names of the fields stored in the MED file
+        """
+        return list(self.__med_root['/CHA'].keys())
+
+    def get_field_steps(self, field_id):
+        """
+        Method which returns the time steps (step number, time value) already
+        stored for a field, sorted by step number, [] for a new field
+        """
+        if field_id not in self.__med_root['/CHA'].keys():
+            return []
+        grp_sol = self.__med_root['/CHA/'+field_id]
+        steps = [(int(grp_sol[key].attrs['NDT']), float(grp_sol[key].attrs['PDT'])) for key in grp_sol.keys()]
+        return sorted(steps)
+
+    def get_profiles_names(self):
+        """
+        Method which returns the names of the profiles stored in the MED file
+        """
+        if "PROFILS" not in self.__med_root.keys():
+            return []
+        return list(self.__med_root['/PROFILS'].keys())
+
+    def flush(self):
+        """
+        Method which flushes the buffered data in the MED file
+        """
+        self.__med_root.flush()
+        self.__unflushed = 0
+
+    def start_swmr(self):
+        """
+        Method which switches the MED file, opened by MEDWriter(swmr=True), to the
+        HDF5 single writer multiple readers mode : the readers (MEDReader(swmr=True))
+        can then open the file. The SWMR mode doesn't allow to create, or delete,
+        HDF5 objects and attributes : the meshes and fields structure must be
+        written before, the steps written in SWMR mode are the ones reserved by
+        reserve_field_steps. The mode is left by end(), which removes the reserved
+        steps not written (see finalize_reserved_steps).
+        """
+        if not self.__swmr:
+            raise RuntimeError("The MED file {} isn't opened by MEDWriter(swmr=True)".format(self.__med_root.filename))
+        self.flush()
+        self.__med_root.swmr_mode = True
+        self.__swmr_mode = True
+
+    def __check_structure(self, action):
+        ## the HDF5 objects can't be created in SWMR mode, see start_swmr
+        if self.__swmr_mode:
+            raise RuntimeError("The MED file {} is in SWMR mode, {} isn't allowed : the meshes and "
+                               "the fields steps (see reserve_field_steps) are written before "
+                               "start_swmr()".format(self.__med_root.filename, action))
+
+    def __step_written(self):
+        ## flush policy, see __init__
+        self.__unflushed += 1
+        if self.__flush is not None and self.__unflushed >= self.__flush:
+            self.flush()
         
     def add_group(self, grp_name, attrs):
+        self.__check_structure("creating the group {}".format(grp_name))
         grp = self.__med_root.create_group(grp_name)
         for key, value in attrs.items():
             grp.attrs.create(key, data=value)
         
     def add_dataset(self, set_name, value):
-        self.__med_root.create_dataset(set_name, data=value)
+        self.__check_structure("creating the dataset {}".format(set_name))
+        self._create_dataset(self.__med_root, set_name, value)
+
+    def _create_dataset(self, group, name, data, nbr=None, dtype=None):
+        """
+        Method which create a dataset with the writer storage options
+
+        Parameters
+        -----------
+        group : h5py.Group
+             the parent group
+        name : string
+             the dataset name
+        data : ndarray
+             the dataset values
+        nbr : int (optional)
+             the length of one component for datasets stored component by
+             component (COO, NOD, CO), chunks are then aligned on it
+        dtype : the dataset dtype (optional)
+        """
+        data = np.asarray(data, dtype=dtype)
+        storage = self.__storage
+        filters = storage["compression"] is not None or storage["shuffle"] or storage["fletcher32"]
+        if data.ndim != 1 or data.size == 0 or (storage["chunks"] is None and not filters):
+            return group.create_dataset(name, data=data)
+
+        chunk = storage["chunks"] if storage["chunks"] is not None else _CHUNK_SIZE
+        length = nbr if nbr else data.shape[0]
+        chunk = int(np.ceil(length / np.ceil(length / float(chunk))))
+        return group.create_dataset(name, data=data, chunks=(min(chunk, data.shape[0]),),
+                                    compression=storage["compression"],
+                                    compression_opts=storage["compression_opts"],
+                                    shuffle=storage["shuffle"], fletcher32=storage["fletcher32"])
         
     def end(self):
+        if not self.__swmr:
+            self.__med_root.close()
+            return None
+        ## the reserved steps not written are removed out of the SWMR mode
+        med_file = self.__med_root.filename
         self.__med_root.close()
-        
+        if not finalize_reserved_steps(med_file):
+            _LOGGER.warning("MED file {} is still read, the reserved steps not written are removed by "
+                            "pyMEDio.finalize_reserved_steps once the readers are closed".format(med_file))
+
     def write_mesh(self, mesh_obj, iteration=1):
         """
         Method which write mesh informations; coordinates, connectivity, groups
@@ -100,10 +384,48 @@ class MEDWriter(object):
         iteration : int (optional)
               the iteration number associated to this mesh
         """
-        grp_0_0 = self.__med_root['/ENS_MAA'].create_group(mesh_obj.NAME)
+        blocks = {}
+        for e_type in mesh_obj.ELEMS.keys():
+            num, nodes, fam = mesh_obj.get_block(e_type)
+            blocks[e_type] = (nodes, fam, num)
+        self.write_mesh_arrays(mesh_obj.NAME, mesh_obj.COOR, blocks, mesh_obj.FAMILY_NAMES, iteration,
+                               mesh_obj.NODE_FAMILIES, mesh_obj.NODE_FAMILY_NAMES)
+
+    def write_mesh_arrays(self, name, coords, blocks, families=None, iteration=1, node_families=None,
+                          node_family_names=None):
+        """
+        Method which write a mesh given as numpy arrays, without building a Mesh object
+
+        Parameters 
+        ------------
+        name : string
+              the name of the mesh
+        coords : ndarray
+              the nodes coordinates, array of size (NN, 3), or (NN, 2) for a 2D mesh
+        blocks : dict
+              dictionnary {type_id : block}, with type_id in the writer input_format
+              and block either the (ne_t, nn) nodes array of the elements (0-based)
+              or a tuple (nodes, fam, num) as in Mesh.set_blocks; fam are the elements
+              family ids and num the elements index (0-based), both can be None
+        families : dict (optional)
+              dictionnary {family id : group name}, family 0 is FAMILLE_ZERO
+        iteration : int (optional)
+              the iteration number associated to this mesh
+        node_families : ndarray (optional)
+              the family id of each node, 0 for the nodes without family
+        node_family_names : dict (optional)
+              dictionnary {family id : group name} of the nodes families
+        """
+        self.__check_structure("writing the mesh {}".format(name))
+        coords = np.asarray(coords)
+        NN, ESP = coords.shape
+        if name in self.__med_root['/ENS_MAA'].keys():
+            _LOGGER.error("The mesh {} already exists in the MED file".format(name))
+            sys.exit(5)
+        grp_0_0 = self.__med_root['/ENS_MAA'].create_group(name)
         grp_0_0.attrs.create('DES', data=b'')
-        grp_0_0.attrs.create('DIM', data=3, dtype=np.int32)
-        grp_0_0.attrs.create('ESP', data=3, dtype=np.int32)
+        grp_0_0.attrs.create('DIM', data=ESP, dtype=np.int32)
+        grp_0_0.attrs.create('ESP', data=ESP, dtype=np.int32)
         grp_0_0.attrs.create('NOM', data=b'')
         grp_0_0.attrs.create('NXI', data=-1, dtype=np.int32)
         grp_0_0.attrs.create('NXT', data=-1, dtype=np.int32)
@@ -128,66 +450,153 @@ class MEDWriter(object):
         grp_0_0_0_NOE.attrs.create('CGT', data=1, dtype=np.int32)
         grp_0_0_0_NOE.attrs.create('PFL', data=b'MED_NO_PROFILE_INTERNAL', dtype=np.dtype('a24'))
         
-        d1 = grp_0_0_0_NOE.create_dataset("NUM", data=(np.arange(mesh_obj.COOR.shape[0])+1) )
+        d1 = self._create_dataset(grp_0_0_0_NOE, "NUM", np.arange(NN, dtype=np.int32)+1)
         d1.attrs.create('CGT', data=1, dtype=np.int32)
-        d1.attrs.create('NBR', data=mesh_obj.COOR.shape[0], dtype=np.int32)
-        d2 = grp_0_0_0_NOE.create_dataset("COO", data=mesh_obj.COOR.T.ravel())
+        d1.attrs.create('NBR', data=NN, dtype=np.int32)
+        d2 = self._create_dataset(grp_0_0_0_NOE, "COO", coords.T.ravel(), nbr=NN, dtype=self.__stored_dtype(coords))
         d2.attrs.create('CGT', data= 1, dtype=np.int32)
-        d2.attrs.create('NBR', data= mesh_obj.COOR.shape[0], dtype=np.int32)
-        d3 = grp_0_0_0_NOE.create_dataset("FAM", data=np.zeros(mesh_obj.COOR.shape[0],dtype=np.int32)) 
+        d2.attrs.create('NBR', data= NN, dtype=np.int32)
+        if node_families is None:
+            node_families = np.zeros(NN, dtype=np.int32)
+        d3 = self._create_dataset(grp_0_0_0_NOE, "FAM", np.asarray(node_families, dtype=np.int32))
         d3.attrs.create('CGT', data= 1, dtype=np.int32)
-        d3.attrs.create('NBR', data= mesh_obj.COOR.shape[0], dtype=np.int32)
+        d3.attrs.create('NBR', data= NN, dtype=np.int32)
         grp_0_0_0_MAI = grp_0_0_0.create_group('MAI')
         grp_0_0_0_MAI.attrs.create('CGT', data=1, dtype=np.int32)
 
-        group_dict = self.__group_rename(mesh_obj)
+        e_offset = 0
+        for e_type, block in blocks.items():
+            if isinstance(block, np.ndarray):
+                block = (block, None, None)
+            nodes, fam, num = block
+            NE_t = nodes.shape[0]
+            if fam is None:
+                fam = np.zeros(NE_t, dtype=np.int32)
+            if num is None:
+                num = np.arange(e_offset, e_offset+NE_t)
+            e_offset += NE_t
 
-        for e_type in mesh_obj.ELEMS.keys():
             grp_0_0_0_MAI_E = grp_0_0_0_MAI.create_group(self.__translator[e_type]['id'])
             grp_0_0_0_MAI_E.attrs.create('CGS',data=1, dtype=np.int32)
             grp_0_0_0_MAI_E.attrs.create('CGT',data=1, dtype=np.int32)
-            grp_0_0_0_MAI_E.attrs.create('GEO',data=self.__translator[e_type]['geo'], dtype=np.int32)
+            grp_0_0_0_MAI_E.attrs.create('GEO',data=_MED2MED[self.__translator[e_type]['id']]['geo'], dtype=np.int32)
             grp_0_0_0_MAI_E.attrs.create('PFL', data=b'MED_NO_PROFILE_INTERNAL', dtype=np.dtype('a24'))
-            elem_lst = mesh_obj.ELEMS[e_type]
-            nod_array = np.zeros((len(elem_lst),self.__translator[e_type]['nn']),dtype=np.int32)
-            num_array  = np.zeros(len(elem_lst),dtype=np.int32)
-            fam_array  = np.zeros(len(elem_lst),dtype=np.int32)
-            for i,e in enumerate(elem_lst):
-                elem = mesh_obj.CONNEC[e]
-                nod_array[i,:] = np.array(elem[3:]) + 1
-                num_array[i] = elem[0]+1
-                fam_array[i] = group_dict[elem[2]]
-                
-
-            d1 = grp_0_0_0_MAI_E.create_dataset("NOD",data=nod_array.T.ravel())
+            ## MED connectivity is stored node-major : all first nodes, then all second nodes ...
+            nod_array = np.asarray(nodes, dtype=np.int32).T.ravel() + 1
+            num_array = np.asarray(num, dtype=np.int32) + 1
+            fam_array = np.asarray(fam, dtype=np.int32)
+
+            d1 = self._create_dataset(grp_0_0_0_MAI_E, "NOD", nod_array, nbr=NE_t)
             d1.attrs.create('CGT', data=1, dtype=np.int32)
-            d1.attrs.create('NBR', num_array.shape[0], dtype=np.int32)
-            d2 = grp_0_0_0_MAI_E.create_dataset("NUM",data=num_array)
+            d1.attrs.create('NBR', NE_t, dtype=np.int32)
+            d2 = self._create_dataset(grp_0_0_0_MAI_E, "NUM", num_array)
             d2.attrs.create('CGT', data=1, dtype=np.int32)
-            d2.attrs.create('NBR', num_array.shape[0], dtype=np.int32)
-            d3 = grp_0_0_0_MAI_E.create_dataset("FAM",data=fam_array)
+            d2.attrs.create('NBR', NE_t, dtype=np.int32)
+            d3 = self._create_dataset(grp_0_0_0_MAI_E, "FAM", fam_array)
             d3.attrs.create('CGT', data=1, dtype=np.int32)
-            d3.attrs.create('NBR', num_array.shape[0], dtype=np.int32)
-
-        grp_1_0 = self.__med_root['/FAS'].create_group(mesh_obj.NAME)
-        grp_1_0_ELEME = grp_1_0.create_group('ELEME')
-        for key,value in group_dict.items():
-            grp_1_0_ELEME_KEY = grp_1_0_ELEME.create_group("FAM_{}_{}".format(value,key))
-            grp_1_0_ELEME_KEY.attrs.create('NUM', data=value, dtype=np.int32)
-            grp_1_0_ELEME_KEY_GRO = grp_1_0_ELEME_KEY.create_group("GRO")
-            grp_1_0_ELEME_KEY_GRO.attrs.create('NBR', data=1, dtype=np.int32)
-            dset = grp_1_0_ELEME_KEY_GRO.create_dataset("NOM", (1,), dtype=('i1',(80,)))
-            key_reduce = key.strip()
-            dset[0] = bytearray(key_reduce.ljust(80), 'utf-8')
+            d3.attrs.create('NBR', NE_t, dtype=np.int32)
+
+        grp_1_0 = self.__med_root['/FAS'].create_group(name)
+        self.__write_families(grp_1_0.create_group('ELEME'), families)
+        if node_family_names:
+            self.__write_families(grp_1_0.create_group('NOEUD'), node_family_names)
         grp_1_0_KEY = grp_1_0.create_group("FAMILLE_ZERO")
         grp_1_0_KEY.attrs.create('NUM', data=0)
+        if self.__flush is not None:
+            self.flush()
+
+    def write_mesh_iteration(self, name, coords, iteration, time=0.):
+        """
+        Method which adds an iteration (computation step) of an already written
+        mesh whose nodes coordinates only change, e.g. the deformed states of a
+        large displacements or ALE computation. The connectivity, numbering and
+        families of the new iteration are HDF5 soft links to the ones of the first
+        iteration, only the coordinates are stored. The fields steps with the same
+        step number are defined on this iteration (RDT, ROR attributes).
+
+        Parameters
+        ------------
+        name : string
+              the name of the mesh, already written
+        coords : ndarray
+              the nodes coordinates of the iteration, array of size (NN, ESP)
+        iteration : int
+              the step number of the iteration (NDT = NOR = iteration)
+        time : float (optional)
+              the time value of the iteration
+        """
+        self.__check_structure("writing an iteration of the mesh {}".format(name))
+        if name not in self.__med_root['/ENS_MAA'].keys():
+            _LOGGER.error("The mesh {} must be written before its iterations".format(name))
+            sys.exit(5)
+        grp_msh = self.__med_root['/ENS_MAA/'+name]
+        coords = np.asarray(coords)
+        idens = sorted(grp_msh.keys())
+        first, last = grp_msh[idens[0]], grp_msh[idens[-1]]
+        NN = int(first['NOE/COO'].attrs['NBR'])
+        if coords.shape != (NN, int(grp_msh.attrs['ESP'])):
+            _LOGGER.error("The iteration coordinates of mesh {} have shape {} instead of {}".format(
+                name, coords.shape, (NN, int(grp_msh.attrs['ESP']))))
+            sys.exit(5)
+        iden = "%020d%020d"%(iteration, iteration)
+        if iden in grp_msh:
+            _LOGGER.error("The iteration {} of mesh {} already exists".format(iteration, name))
+            sys.exit(5)
+
+        ## the iterations are chained by their previous (PVI, PVT) and next (NXI, NXT) iterations
+        grp_it = grp_msh.create_group(iden)
+        grp_it.attrs.create('CGT', data=1, dtype=np.int32)
+        grp_it.attrs.create('NDT', data=iteration, dtype=np.int32)
+        grp_it.attrs.create('NOR', data=iteration, dtype=np.int32)
+        grp_it.attrs.create('NXI', data=-1, dtype=np.int32)
+        grp_it.attrs.create('NXT', data=-1, dtype=np.int32)
+        grp_it.attrs.create('PDT', data=time, dtype=np.float64)
+        grp_it.attrs.create('PVI', data=last.attrs['NDT'], dtype=np.int32)
+        grp_it.attrs.create('PVT', data=last.attrs['NOR'], dtype=np.int32)
+        last.attrs.modify('NXI', iteration)
+        last.attrs.modify('NXT', iteration)
 
-    def __group_rename(self, mesh_obj):
-        grp_list = mesh_obj.GROUPS
-        grp_dict = {}
-        for i, grp in enumerate(grp_list):
-            grp_dict[grp] = -(i+1)
-        return grp_dict
+        grp_noe = grp_it.create_group('NOE')
+        grp_noe.attrs.create('CGS', data=1, dtype=np.int32)
+        grp_noe.attrs.create('CGT', data=1, dtype=np.int32)
+        grp_noe.attrs.create('PFL', data=b'MED_NO_PROFILE_INTERNAL', dtype=np.dtype('a24'))
+        d1 = self._create_dataset(grp_noe, "COO", coords.T.ravel(), nbr=NN, dtype=self.__stored_dtype(coords))
+        d1.attrs.create('CGT', data=1, dtype=np.int32)
+        d1.attrs.create('NBR', data=NN, dtype=np.int32)
+        ## the topology is shared with the first iteration
+        for key in ('NUM', 'FAM'):
+            if key in first['NOE']:
+                grp_noe[key] = h5py.SoftLink(first['NOE'][key].name)
+        grp_it['MAI'] = h5py.SoftLink(first['MAI'].name)
+        if self.__flush is not None:
+            self.flush()
+
+    def __mesh_iteration(self, mesh_name, step):
+        ## the mesh iteration (RDT, ROR) of a field step, -1 for the first iteration
+        grp_msh = self.__med_root['/ENS_MAA'].get(mesh_name)
+        if grp_msh is not None and "%020d%020d"%(step, step) in grp_msh:
+            return step
+        return -1
+
+    def __write_families(self, grp_fas, families):
+        """
+        Method which writes the families {family id : group name} of the mesh
+        entities in grp_fas (FAS/<mesh>/ELEME or NOEUD), family 0 is FAMILLE_ZERO,
+        the name of a family in several groups is the tuple of the group names
+        """
+        if families is None:
+            families = {}
+        for value, key in families.items():
+            if value == 0:
+                continue
+            names = [name.strip() for name in (key if isinstance(key, tuple) else (key,))]
+            grp_fas_KEY = grp_fas.create_group("FAM_{}_{}".format(value,"_".join(names)))
+            grp_fas_KEY.attrs.create('NUM', data=value, dtype=np.int32)
+            grp_fas_KEY_GRO = grp_fas_KEY.create_group("GRO")
+            grp_fas_KEY_GRO.attrs.create('NBR', data=len(names), dtype=np.int32)
+            dset = grp_fas_KEY_GRO.create_dataset("NOM", (len(names),), dtype=('i1',(80,)))
+            for i, name in enumerate(names):
+                dset[i] = np.frombuffer(name.ljust(80).encode('utf-8'), dtype='i1')
 
     def __group_adapt(self, group):
         for i in range(80-len(group)):
@@ -195,22 +604,35 @@ class MEDWriter(object):
         return bytearray(group, 'utf-8')
 
     def write_field_at_time(self, field, groups=None, time=0., ite=0): 
+        if "SWMR" in self.__med_root.keys() and field.NAME in self.__med_root['/SWMR'].keys():
+            ## the steps of the field are reserved, see reserve_field_steps
+            self.__write_reserved_step(field, groups, (time, ite))
+            self.__step_written()
+            return None
+        if field.INDEX is not None:
+            ## a sparse field is written on its own profile
+            self._write_sparse_field_at_time(field, (time, ite))
+            self.__step_written()
+            return None
         # compute profil if required
         profils = None
         if groups is not None:
             profils = self.__compute_profile(groups, field.MESH, field.SUPPORT)
         if field.PROFILS is not None:
             profils = field.PROFILS
+            if field.SUPPORT != "NODES":
+                profils = self.__split_profile(field.MESH, profils)
 
         if field.SUPPORT == "NODES":
             self._write_field_on_nodes_at_time(field.MESH, field.NAME, field[:], field.COMPONENTS, profils, (time, ite))
         elif field.SUPPORT == "ELEMS":
             self._write_field_on_elems_at_time(field.MESH, field.NAME, field[:], field.COMPONENTS, field.MESH.ELEMS , (time, ite), profils)
         elif field.SUPPORT == "GAUSS":
-            self._write_field_on_gauss_at_time(field.MESH, field.NAME, field[:], field.COMPONENTS, (time, ite))
+            self._write_field_on_gauss_at_time(field.MESH, field.NAME, field[:], field.COMPONENTS, field.MESH.ELEMS, field.NGAUSS, (time, ite), profils)
+        self.__step_written()
 
     def _write_field_on_nodes_at_time(self, mesh, field_id, field, COMPO, profils, time): 
-        grp = self.__field_structure(mesh, field_id, COMPO, time)
+        grp = self.__field_structure(mesh, field_id, COMPO, time, self.__stored_dtype(field))
         grp_noe = grp.create_group("NOE")
         grp_noe.attrs.create('GAU', data=b'')
         if profils is None:
@@ -218,133 +640,572 @@ class MEDWriter(object):
             profil_name = 'MED_NO_PROFILE_INTERNAL'
         else:
             profil_name = list(profils.keys())[0]
-            self.__create_profil(profil_name, profils[profil_name], 0)
+            index = profils[profil_name]
+            profil_name = self.__create_profil(profil_name, index, 0)
             grp_noe.attrs.create('PFL', data=profil_name.encode(), dtype=np.dtype('a24'))
             ## then reduce field to profil index
-            field = field[profils[profil_name]]
+            field = field[index]
         ## level 4
         grp_4 = grp_noe.create_group(profil_name)
         grp_4.attrs.create('GAU', data=b'')
         grp_4.attrs.create('NBR', data=field.shape[0], dtype=np.int32)
         grp_4.attrs.create('NGA', data=1, dtype=np.int32)
         data2store = field.T.ravel()
-        data_value = grp_4.create_dataset("CO", data=data2store)
+        self._create_dataset(grp_4, "CO", data2store, nbr=field.shape[0], dtype=self.__stored_dtype(field))
         
     def _write_field_on_elems_at_time(self, mesh, field_id, field, COMPO, types_dict, time, profils):
-        grp = self.__field_structure(mesh, field_id, COMPO, time)
+        grp = self.__field_structure(mesh, field_id, COMPO, time, self.__stored_dtype(field))
 
         if profils is None:
             for e_type, e_list in types_dict.items():
-                grp_mai = grp.create_group("MAI."+self.__translator[e_type]['id'])
-                grp_mai.attrs.create('GAU', data=b'')
-                prof_name = 'MED_NO_PROFILE_INTERNAL'
-                e_id = e_list
-                grp_mai.attrs.create('PFL', data=prof_name.encode(), dtype=np.dtype('a24'))
-                ## level 4
-                grp_4 = grp_mai.create_group(prof_name)
-                grp_4.attrs.create('GAU', data=b'')
-                grp_4.attrs.create('NBR', data=len(e_id), dtype=np.int32)
-                grp_4.attrs.create('NGA', data=1, dtype=np.int32)
-                data2store = field[e_id,:].T.ravel()
-                data_value = grp_4.create_dataset("CO", data=data2store)
+                self.__write_entity_values(grp, "MAI."+self.__translator[e_type]['id'],
+                                           'MED_NO_PROFILE_INTERNAL', field[e_list])
         else:
-            for e_type, prof in profils.items():
-                grp_mai = grp.create_group("MAI."+self.__translator[e_type]['id'])
-                grp_mai.attrs.create('GAU', data=b'')
-                prof_name = list(prof.keys())[0]   ###list(profils.keys())[0]
-                e_id = prof[prof_name]
-                self.__create_profil(prof_name, np.array(e_id), types_dict[e_type][0])
-                grp_mai.attrs.create('PFL', data=prof_name.encode(), dtype=np.dtype('a24'))
-                ## level 4
-                grp_4 = grp_mai.create_group(prof_name)
-                grp_4.attrs.create('GAU', data=b'')
-                grp_4.attrs.create('NBR', data=len(e_id), dtype=np.int32)
-                grp_4.attrs.create('NGA', data=1, dtype=np.int32)
-                data2store = field[e_id,:].T.ravel()
-                data_value = grp_4.create_dataset("CO", data=data2store)
+            for e_type, prof_name, e_id, local in profils:
+                prof_name = self.__create_profil(prof_name, local, 0)
+                self.__write_entity_values(grp, "MAI."+self.__translator[e_type]['id'], prof_name, field[e_id])
         
-    def _write_field_on_gauss_at_time(self, mesh, field_id, field, COMPO, types_dict, time):
-        grp = self.__field_structure(mesh, field_id, COMPO, time)
-        for e_type, e_list in types_dict.items():
-            gauss_e = self.med_root['/GAUSS'].create_group(VTK2MED[e_type]['id']+'__PG')
-            gauss_e.attrs.create('DIM', data=3, dtype=np.int32)
-            gauss_e.attrs.create('GEO', data=VTK2MED[e_type]['id'], dtype=np.int32)
-            gauss_e.attrs.create('INM', data=b'')
-            #gauss_e.attrs.create('NBR', data=ELEM_DB[type]['N_PG'])
-            
-            grp_mai = grp.create_group("MAI."+VTK2MED[e_type]['id'])
-            grp_mai.attrs.create('GAU', data=b'')
-            grp_mai.attrs.create('PFL', data=b'MED_NO_PROFILE_INTERNAL', dtype=np.dtype('a24'))
-            ## level 4
-            grp_4 = grp_mai.create_group('MED_NO_PROFILE_INTERNAL')
-            grp_4.attrs.create('GAU', data=b'')
-            grp_4.attrs.create('NBR', data=len(e_list), dtype=np.int32)
-            grp_4.attrs.create('NGA', data=1, dtype=np.int32)
-            data2store = field[e_list,:].T.ravel()
-            data_value = grp_4.create_dataset("CO", data=data2store)
-    
-    def __field_structure(self, mesh, field_id, COMPO, time):
+    def _write_sparse_field_at_time(self, field, time):
+        """
+        Method which writes a field stored on a profile (Field.INDEX), the values
+        are written from the compact storage, without dense expansion
+        """
+        values = field[:]
+        grp = self.__field_structure(field.MESH, field.NAME, field.COMPONENTS, time, self.__stored_dtype(values))
+        if field.SUPPORT == "NODES":
+            base_name = field.NAME+"_PFL"
+            if field.PROFILS is not None:
+                base_name = list(field.PROFILS.keys())[0]
+            profil_name = self.__create_profil(base_name, field.INDEX, 0)
+            self.__write_entity_values(grp, "NOE", profil_name, values)
+            return None
+        mesh = field.MESH
+        types = mesh.TYPES[field.INDEX]
+        for code in np.unique(types):
+            e_type = mesh.TYPE_IDS[code]
+            med_type = self.__translator[e_type]['id']
+            mask = types == code
+            ## profiles index are the positions in the elements of the type
+            local = np.searchsorted(mesh.ELEMS[e_type], field.INDEX[mask])
+            profil_name = self.__create_profil("{}_{}".format(field.NAME, med_type), local, 0)
+            if field.SUPPORT == "GAUSS":
+                n_g = field.NGAUSS[e_type]
+                gauss_name = self.__create_localization(med_type, n_g)
+                self.__write_entity_values(grp, "MAI."+med_type, profil_name, values[mask, :n_g], gauss_name)
+            else:
+                self.__write_entity_values(grp, "MAI."+med_type, profil_name, values[mask])
+
+    def __write_entity_values(self, grp, entity, profil_name, values, gauss_name=''):
+        """
+        Method which writes the values of one entity (NOE or MAI.<type>) of a field
+        step, values is (n, NCOMPO) or (n, NGA, NCOMPO) for Gauss points values
+        """
+        grp_e = grp.create_group(entity)
+        grp_e.attrs.create('GAU', data=gauss_name.encode())
+        grp_e.attrs.create('PFL', data=profil_name.encode(), dtype=np.dtype('a24'))
+        ## level 4
+        n_g = values.shape[1] if values.ndim == 3 else 1
+        grp_4 = grp_e.create_group(profil_name)
+        grp_4.attrs.create('GAU', data=gauss_name.encode())
+        grp_4.attrs.create('NBR', data=values.shape[0], dtype=np.int32)
+        grp_4.attrs.create('NGA', data=n_g, dtype=np.int32)
+        if values.ndim == 3:
+            data2store = values.transpose(2, 0, 1).ravel()
+        else:
+            data2store = values.T.ravel()
+        self._create_dataset(grp_4, "CO", data2store, nbr=values.shape[0]*n_g, dtype=self.__stored_dtype(values))
+
+    def _write_field_on_gauss_at_time(self, mesh, field_id, field, COMPO, types_dict, ngauss, time, profils=None):
+        grp = self.__field_structure(mesh, field_id, COMPO, time, self.__stored_dtype(field))
+        if profils is None:
+            profils = [(e_type, 'MED_NO_PROFILE_INTERNAL', e_list, None) for e_type, e_list in types_dict.items()]
+        for e_type, prof_name, e_id, local in profils:
+            med_type = self.__translator[e_type]['id']
+            n_g = ngauss[e_type]
+            gauss_name = self.__create_localization(med_type, n_g)
+            if local is not None:
+                prof_name = self.__create_profil(prof_name, local, 0)
+            ## for each component the values of the Gauss points of an element are contiguous
+            self.__write_entity_values(grp, "MAI."+med_type, prof_name, field[e_id, :n_g], gauss_name)
+
+    def __create_localization(self, med_type, n_g):
+        """
+        Method which create, once, the Gauss points localization of an element
+        type in the /GAUSS group, returns its name ('' for a single point element).
+        The localizations given to write_gauss_localizations are used first.
+        """
+        if (med_type, n_g) in self.__localizations:
+            return self.__localizations[(med_type, n_g)]
+        if med_type not in _MED_GAUSS:
+            if n_g > 1:
+                raise ValueError("No Gauss points localization available for elements {}".format(med_type))
+            return ''
+        loc = _MED_GAUSS[med_type]
+        if len(loc["weights"]) != n_g:
+            raise ValueError("Elements {} have {} Gauss points, the localization defines {}".format(med_type, n_g, len(loc["weights"])))
+        gauss_name = med_type+'__PG'
+        if gauss_name not in self.__med_root['/GAUSS'].keys():
+            self.__write_localization(gauss_name, med_type, loc["ref"], loc["gauss"], loc["weights"])
+        return gauss_name
+
+    def __write_localization(self, gauss_name, med_type, ref, gauss, weights):
+        self.__check_structure("writing the Gauss points localization {}".format(gauss_name))
+        ref = np.asarray(ref, dtype=np.float64)
+        gauss_e = self.__med_root['/GAUSS'].create_group(gauss_name)
+        gauss_e.attrs.create('DIM', data=ref.shape[1], dtype=np.int32)
+        gauss_e.attrs.create('GEO', data=int(_MED2MED[med_type]['geo']), dtype=np.int32)
+        gauss_e.attrs.create('NBR', data=len(weights), dtype=np.int32)
+        gauss_e.attrs.create('INM', data=b'')
+        gauss_e.create_dataset('COO', data=np.ravel(ref))
+        gauss_e.create_dataset('GAU', data=np.ravel(gauss).astype(np.float64))
+        gauss_e.create_dataset('VAL', data=np.asarray(weights, dtype=np.float64))
+        self.__localizations[(med_type, len(weights))] = gauss_name
+
+    def write_gauss_localizations(self, localizations):
+        """
+        Method which writes Gauss points localizations, the Gauss points fields
+        are then written with the localization of their elements type and number
+        of Gauss points instead of the default one. Used to copy the fields of an
+        other MED file, with its own Gauss points.
+
+        Parameters
+        -----------
+        localizations : dict
+             {name : {"type", "ref", "gauss", "weights"}} as returned by
+             MEDReader.get_gauss_localizations, an existing name is kept
+        """
+        for gauss_name, loc in localizations.items():
+            if gauss_name in self.__med_root['/GAUSS'].keys():
+                continue
+            if loc["type"] not in _MED2MED:
+                _LOGGER.warning("The Gauss points localization {} of unknown elements {} is not written".format(
+                    gauss_name, loc["type"]))
+                continue
+            self.__write_localization(gauss_name, loc["type"], loc["ref"], loc["gauss"], loc["weights"])
+
+    def write_field_series(self, field_name, mesh, values, times, iterations=None, profile=None,
+                           components=None, support="NODES"):
+        """
+        Method which writes many time steps of a field at once, faster than a
+        loop of write_field_at_time for small fields : the HDF5 structure of a
+        step (groups, attributes, datasets) is built once in a template, then
+        copied for each step, only the step numbers, time values and field
+        values are written. The profile is written once.
+
+        Parameters
+        -----------
+        field_name : string
+             the name of the field
+        mesh : Mesh
+             the mesh of the field
+        values : ndarray
+             the values of the steps, array of size (nsteps, n, NCOMPO), with n the
+             number of nodes (NODES) or elements (ELEMS) of the mesh, or of the profile
+        times : array_like
+             the time value of each step
+        iterations : array_like (optional)
+             the step number of each step, default 0, 1, ..., nsteps-1
+        profile : None, string or dict (optional)
+             the field restriction : a group name, or {profile name : index} as
+             Field.PROFILS
+        components : list of string (optional)
+             the components names, default C0, C1, ...
+        support : string {"NODES", "ELEMS"}, default "NODES"
+             the field support
+        """
+        values = np.asarray(values)
+        dtype = self.__stored_dtype(values)
+        if values.ndim == 2:
+            values = values[:, :, np.newaxis]
+        nsteps, n, ncompo = values.shape
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        if iterations is None:
+            iterations = np.arange(nsteps)
+        iterations = np.asarray(iterations, dtype=np.int64).reshape(-1)
+        if times.shape[0] != nsteps or iterations.shape[0] != nsteps:
+            _LOGGER.error("The field {} has {} steps of values, {} times and {} iterations are given".format(
+                field_name, nsteps, times.shape[0], iterations.shape[0]))
+            sys.exit(5)
+        if components is None:
+            components = ["C{}".format(i) for i in range(ncompo)]
+
+        ## entities of a step : (entity, profile name, rows of values)
+        entities = self.__series_entities(field_name, mesh, n, profile, support)
+        ## values of each entity, component by component, for all steps
+        data = [np.ascontiguousarray(values[:, rows].transpose(0, 2, 1).reshape(nsteps, -1), dtype=dtype)
+                for entity, profil_name, rows in entities]
+
+        self.__write_steps(field_name, mesh, entities, data, ncompo, components, dtype, times, iterations)
+
+    def reserve_field_steps(self, field_name, mesh, iterations, components, profile=None,
+                            support="NODES", dtype=np.float64):
+        """
+        Method which creates the steps of a field before they are computed, filled
+        with zeros : the HDF5 objects can't be created in SWMR mode (see start_swmr),
+        the reserved steps are then written by write_field_at_time, with the same
+        profile. Only the written steps are read by MEDReader, their time values are
+        the ones given to write_field_at_time. The steps not written are removed by
+        end(), or by finalize_reserved_steps if readers still opened the file : until
+        then the other MED tools read them, with zero values and time values.
+
+        Parameters
+        -----------
+        field_name : string
+             the name of the field
+        mesh : Mesh
+             the mesh of the field
+        iterations : int or array_like
+             the number of steps, numbered 0, 1, ..., or the step numbers
+        components : list of string
+             the components names
+        profile : None, string or dict (optional)
+             the field restriction : a group name, or {profile name : index} as
+             Field.PROFILS
+        support : string {"NODES", "ELEMS"}, default "NODES"
+             the field support
+        dtype : numpy float dtype, default np.float64
+             the type of the values, the writer dtype if given
+        """
+        self.__check_structure("reserving the steps of field {}".format(field_name))
+        if np.ndim(iterations) == 0:
+            iterations = np.arange(iterations)
+        iterations = np.asarray(iterations, dtype=np.int64).reshape(-1)
+        dtype = self.__stored_dtype(np.zeros(0, dtype=dtype))
+        n = mesh.NN if support == "NODES" else mesh.NE
+        entities = self.__series_entities(field_name, mesh, n, profile, support)
+        self.__write_steps(field_name, mesh, entities, None, len(components), components, dtype,
+                           np.zeros(iterations.shape[0]), iterations)
+        if "SWMR" not in self.__med_root.keys():
+            self.__med_root.create_group("SWMR")
+        if field_name not in self.__med_root['/SWMR'].keys():
+            self.__med_root['/SWMR'].create_dataset(field_name, shape=(0,), maxshape=(None,),
+                                                     chunks=(1024,), dtype=_SWMR_STEP)
+        if self.__flush is not None:
+            self.flush()
+
+    def __write_reserved_step(self, field, groups, time):
+        """
+        Method which writes the values of a step reserved by reserve_field_steps :
+        the CO datasets are written in place and the step is added to the written
+        steps of the field (/SWMR/<field>), the only changes allowed in SWMR mode
+        """
+        f_group = self.__med_root['/CHA/'+field.NAME]
+        step_key = "%.20d%.20d"%(time[0], time[0])
+        if step_key not in f_group:
+            raise RuntimeError("The step {} of field {} isn't reserved (see reserve_field_steps)".format(time[0], field.NAME))
+        if field.INDEX is not None:
+            raise RuntimeError("The sparse field {} can't be written in reserved steps".format(field.NAME))
+        values = field[:]
+        profile = groups if groups is not None else field.PROFILS
+        entities = self.__series_entities(field.NAME, field.MESH, values.shape[0], profile, field.SUPPORT)
+        grp_step = f_group[step_key]
+        for entity, profil_name, rows in entities:
+            path = "{}/{}/CO".format(entity, profil_name)
+            data = values[rows].T.ravel()
+            if path not in grp_step or grp_step[path].shape != data.shape:
+                raise RuntimeError("The step {} of field {} is reserved with an other support, profile "
+                                   "or components".format(time[0], field.NAME))
+            grp_step[path][...] = data
+        ## the time value is modified in place, the written step is a complete MED step
+        grp_step.attrs.modify('PDT', time[1])
+        progress = self.__med_root['/SWMR/'+field.NAME]
+        progress.resize((progress.shape[0]+1,))
+        progress[-1] = (time[0], time[1])
+
+    def __write_steps(self, field_name, mesh, entities, data, ncompo, components, dtype, times, iterations):
+        """
+        Method which writes the steps of write_field_series and reserve_field_steps,
+        data are the values of each entity for all steps, or None to keep the zeros
+        of the template step
+        """
+        f_group = self.__field_group(mesh, field_name, components, dtype)
+        ## the template step, in a memory file
+        template_file = h5py.File("template_{}".format(id(self)), "w", driver="core", backing_store=False)
+        template = self.__step_group(template_file, field_name, (0, 0.))
+        for entity, profil_name, rows in entities:
+            self.__write_entity_values(template, entity, profil_name,
+                                       np.zeros((rows.shape[0], ncompo), dtype=dtype))
+        datasets = [("{}/{}/CO".format(entity, profil_name)).encode() for entity, profil_name, rows in entities]
+
+        ndt = np.zeros((), dtype=np.int32)
+        pdt = np.zeros((), dtype=np.float64)
+        grp_msh = self.__med_root['/ENS_MAA'].get(mesh.NAME)
+        mesh_iterations = grp_msh is not None and len(grp_msh) > 1
+        for k in range(iterations.shape[0]):
+            step_key = "%.20d%.20d"%(iterations[k], iterations[k])
+            if step_key in f_group:
+                _LOGGER.warning("The step {} of field {} already exists, it is replaced".format(iterations[k], field_name))
+                del f_group[step_key]
+            h5py.h5o.copy(template_file.id, template.name.encode(), f_group.id, step_key.encode())
+            step_id = h5py.h5g.open(f_group.id, step_key.encode())
+            ndt[()] = iterations[k]
+            pdt[()] = times[k]
+            h5py.h5a.open(step_id, b'NDT').write(ndt)
+            h5py.h5a.open(step_id, b'NOR').write(ndt)
+            h5py.h5a.open(step_id, b'PDT').write(pdt)
+            if mesh_iterations:
+                ndt[()] = self.__mesh_iteration(mesh.NAME, iterations[k])
+                h5py.h5a.open(step_id, b'RDT').write(ndt)
+                h5py.h5a.open(step_id, b'ROR').write(ndt)
+            if data is not None:
+                for dataset, entity_data in zip(datasets, data):
+                    h5py.h5d.open(step_id, dataset).write(h5py.h5s.ALL, h5py.h5s.ALL, entity_data[k])
+                self.__step_written()
+        template_file.close()
+
+    def __series_entities(self, field_name, mesh, n, profile, support):
+        """
+        Method which returns the entities [(entity, profile name, rows)] of the
+        steps written by write_field_series, rows are the values of the entity
+        in the n values of a step, the profiles are created
+        """
+        if support not in ("NODES", "ELEMS"):
+            _LOGGER.error("The support {} can't be used to write a series of steps".format(support))
+            sys.exit(5)
+        size = mesh.NN if support == "NODES" else mesh.NE
+        if profile is None:
+            if n != size:
+                _LOGGER.error("The field {} has {} values by step, the mesh has {} {}".format(field_name, n, size, support))
+                sys.exit(5)
+            if support == "NODES":
+                return [("NOE", 'MED_NO_PROFILE_INTERNAL', np.arange(n))]
+            return [("MAI."+self.__translator[e_type]['id'], 'MED_NO_PROFILE_INTERNAL', e_list)
+                    for e_type, e_list in mesh.ELEMS.items()]
+
+        if isinstance(profile, str):
+            profils = self.__compute_profile(profile, mesh, support)
+        elif support == "NODES":
+            profils = profile
+        else:
+            profils = self.__split_profile(mesh, profile)
+        if support == "NODES":
+            profil_name = list(profils.keys())[0]
+            index = np.asarray(profils[profil_name])
+            profil_name = self.__create_profil(profil_name, index, 0)
+            blocks = [("NOE", profil_name, index)]
+        else:
+            blocks = []
+            for e_type, prof_name, e_id, local in profils:
+                prof_name = self.__create_profil(prof_name, local, 0)
+                blocks.append(("MAI."+self.__translator[e_type]['id'], prof_name, e_id))
+        ## the values are given on the whole mesh or only on the profile
+        index = np.sort(np.concatenate([rows for entity, profil_name, rows in blocks]))
+        if n == index.shape[0] and n != size:
+            return [(entity, profil_name, np.searchsorted(index, rows)) for entity, profil_name, rows in blocks]
+        if n != size:
+            _LOGGER.error("The field {} has {} values by step, the profile has {} entities".format(field_name, n, index.shape[0]))
+            sys.exit(5)
+        return blocks
+
+    def copy_field_steps(self, reader, field_id, first_step=0):
+        """
+        Method which copies all time steps of a field from an other MED file,
+        HDF5 to HDF5 without decoding the values : datasets keep their storage
+        layout and filters. The steps are renumbered from first_step (NDT, NOR
+        and steps keys), the PDT time values are kept. The profiles and Gauss
+        localizations used by the steps are copied too.
+
+        Both files are assumed to share the field mesh.
+
+        Parameters
+        -----------
+        reader : MEDReader
+             the reader of the MED file to copy from
+        field_id : string
+             the name of the field to copy
+        first_step : int (optional)
+             the number of the first copied step
+
+        Returns
+        -----------
+        output : int
+             the number of steps copied
+        """
+        self.__check_structure("copying the steps of field {}".format(field_id))
+        src_field = reader.med_root['/CHA/'+field_id]
+        if field_id not in self.__med_root['/CHA'].keys():
+            dst_field = self.__med_root['/CHA'].create_group(field_id)
+            self.__copy_attrs(src_field, dst_field)
+        else:
+            dst_field = self.__med_root['/CHA/'+field_id]
+
+        step = first_step
+        for key in sorted(src_field.keys()):
+            new_key = "%.20d%.20d"%(step, step)
+            reader.med_root.copy(src_field[key], dst_field, name=new_key)
+            dst_step = dst_field[new_key]
+            dst_step.attrs.modify('NDT', step)
+            dst_step.attrs.modify('NOR', step)
+            for e_key in dst_step.keys():
+                self.__copy_step_references(reader, dst_step[e_key])
+            self.__step_written()
+            step += 1
+        return step - first_step
+
+    def __copy_attrs(self, src, dst):
+        for key in src.attrs.keys():
+            dst.attrs.create(key, data=src.attrs[key], dtype=src.attrs.get_id(key).dtype)
+
+    def __copy_step_references(self, reader, grp_e):
+        """
+        Copy the profile and the Gauss localization used by a copied step, the
+        profile is renamed if a different one exists with the same name
+        """
+        profil_name = _to_str(grp_e.attrs['PFL'])
+        if profil_name != "MED_NO_PROFILE_INTERNAL":
+            src_pfl = reader.med_root['/PROFILS/'+profil_name]
+            if "PROFILS" not in self.__med_root.keys():
+                self.__med_root.create_group("PROFILS")
+            dst_profils = self.__med_root['/PROFILS']
+            new_name = profil_name
+            i = 0
+            while new_name in dst_profils.keys() and not self.__same_profile(src_pfl, dst_profils[new_name]):
+                i += 1
+                new_name = "{}_{}".format(profil_name, i)
+            if new_name not in dst_profils.keys():
+                reader.med_root.copy(src_pfl, dst_profils, name=new_name)
+            if new_name != profil_name:
+                grp_e.attrs.modify('PFL', new_name.encode())
+                grp_e.move(profil_name, new_name)
+
+        gauss_name = _to_str(grp_e.attrs['GAU']) if 'GAU' in grp_e.attrs else ''
+        if gauss_name != '' and gauss_name not in self.__med_root['/GAUSS'].keys():
+            reader.med_root.copy(reader.med_root['/GAUSS/'+gauss_name], self.__med_root['/GAUSS'], name=gauss_name)
+
+    def __same_profile(self, pfl_1, pfl_2):
+        if pfl_1.attrs['NBR'] != pfl_2.attrs['NBR']:
+            return False
+        return np.array_equal(pfl_1['PFL'][:], pfl_2['PFL'][:])
+
+    def __field_structure(self, mesh, field_id, COMPO, time, dtype=np.float64):
         """
         Method which create MED file format background for fields writing
         """
+        return self.__step_group(self.__field_group(mesh, field_id, COMPO, dtype), field_id, time,
+                                 self.__mesh_iteration(mesh.NAME, time[0]))
+
+    def __field_group(self, mesh, field_id, COMPO, dtype=np.float64):
+        """
+        Method which returns the group of a field in /CHA, created if needed
+        """
         if field_id not in self.__med_root['/CHA'].keys():
+            self.__check_structure("writing the field {}".format(field_id))
             f_group = self.__med_root['/CHA/'].create_group(field_id) 
             f_group.attrs.create('MAI', data=mesh.NAME,dtype=np.dtype('a15'))
             f_group.attrs.create('NCO', data=len(COMPO), dtype=np.int32)
             components = ''.join([comp.ljust(16) for comp in COMPO])
 
             f_group.attrs.create('NOM', data=components,dtype=np.dtype('a%i'%(17*len(components))))
-            f_group.attrs.create('TYP', data=6, dtype=np.int32)
+            ## MED_FLOAT32 (1) or MED_FLOAT64 (6) values
+            f_group.attrs.create('TYP', data=1 if np.dtype(dtype) == np.float32 else 6, dtype=np.int32)
             f_group.attrs.create('UNI', data='', dtype=np.dtype('a17'))
             f_group.attrs.create('UNT', data='', dtype=np.dtype('a1'))
         else:
             f_group = self.__med_root['/CHA/'+field_id]
-        grp_debile = f_group.create_group("%.20d%.20d"%(time[0], time[0]))
+            ## the field may have been written before the file was opened in append mode
+            if int(f_group.attrs['NCO']) != len(COMPO):
+                _LOGGER.error("The field {} is stored with {} components, {} given".format(field_id, int(f_group.attrs['NCO']), len(COMPO)))
+                sys.exit(5)
+        return f_group
+
+    def __step_group(self, f_group, field_id, time, mesh_iteration=-1):
+        """
+        Method which creates the group of the step time (step number, time value)
+        of a field, defined on the mesh iteration (RDT, ROR), an existing step is
+        replaced
+        """
+        self.__check_structure("writing the step {} of field {}".format(time[0], field_id))
+        step_key = "%.20d%.20d"%(time[0], time[0])
+        if step_key in f_group:
+            _LOGGER.warning("The step {} of field {} already exists, it is replaced".format(time[0], field_id))
+            del f_group[step_key]
+        grp_debile = f_group.create_group(step_key)
         grp_debile.attrs.create('NDT', data=time[0], dtype=np.int32)
         grp_debile.attrs.create('NOR', data=time[0], dtype=np.int32)
         grp_debile.attrs.create('PDT', data=time[1], dtype=np.float64)
-        grp_debile.attrs.create('RDT', data=-1, dtype=np.int32)
-        grp_debile.attrs.create('ROR', data=-1, dtype=np.int32)
+        grp_debile.attrs.create('RDT', data=mesh_iteration, dtype=np.int32)
+        grp_debile.attrs.create('ROR', data=mesh_iteration, dtype=np.int32)
         return grp_debile
 
 
     def __create_profil(self, profil_name, profil_index, e_offset):
         """ 
-        Method which create PROFIL in a med file
+        Method which create PROFIL in a med file, returns the name of the profile :
+        profil_name, or profil_name_<i> if a different profile profil_name already
+        exists (e.g. written before the file was opened in append mode)
         """
+        profil_index = np.asarray(profil_index)
+        stored = profil_index-(e_offset-1)
+        base_name = profil_name
+        i = 0
         if "PROFILS" not in self.__med_root.keys():
-            pfl_group = self.__med_root.create_group("PROFILS")
-        if profil_name not in self.__med_root["/PROFILS"].keys():
-            pfl_group = self.__med_root["/PROFILS"].create_group(profil_name)
-            pfl_group.attrs.create('NBR', data=profil_index.shape[0], dtype=np.int32)
-            pfl_group.create_dataset("PFL", data=profil_index-(e_offset-1), dtype=np.int32)
-        else:
-            pass
-
+            self.__check_structure("writing the profile {}".format(profil_name))
+            self.__med_root.create_group("PROFILS")
+        dst_profils = self.__med_root["/PROFILS"]
+        while profil_name in dst_profils.keys():
+            ## the profiles already checked are kept in memory
+            content = self.__profil_contents.get(profil_name)
+            if content is None:
+                content = dst_profils[profil_name]['PFL'][:]
+                self.__profil_contents[profil_name] = content
+            if np.array_equal(content, stored):
+                return profil_name
+            i += 1
+            profil_name = "{}_{}".format(base_name, i)
+        self.__check_structure("writing the profile {}".format(profil_name))
+        pfl_group = dst_profils.create_group(profil_name)
+        pfl_group.attrs.create('NBR', data=profil_index.shape[0], dtype=np.int32)
+        self._create_dataset(pfl_group, "PFL", stored, dtype=np.int32)
+        self.__profil_contents[profil_name] = stored
+        return profil_name
 
     def __compute_profile(self, groups_name, mesh, support):
+        """
+        Method which computes the profile of a field restricted to a group, the
+        profiles are computed once for each (mesh, group, support)
+            NODES : {groups_name : sorted nodes index}
+            ELEMS, GAUSS : [(type_id, profile name, elements index, positions in the type elements)]
+        """
+        key = (mesh.NAME, groups_name, support)
+        cached = self.__profiles.get(key)
+        if cached is not None and cached[0] is mesh:
+            return cached[1]
         e_id = mesh.GROUPS[groups_name]
         if support == "NODES":
             ## compute node profil
-            node = []
-            for e in e_id:
-                node += mesh.CONNEC[e][3:]
-            node_list = list(set(node))
-            profil = {groups_name:node_list}
-        elif support == "ELEMS":
+            profil = {groups_name: mesh.get_elements_nodes(e_id)}
+        else:
             ## compute elem profil
-            types_elem = {}
-            for key in self.__translator.keys():
-                types_elem[self.__translator[key]['id']] = []
-
-            for e in e_id:
-                e_type = mesh.CONNEC[e][1]
-                types_elem[e_type].append(e)
-
-            profil = {}
-            for key, value in types_elem.items():
-                if len(value) != 0:
-                    profil[key] = {groups_name+"_"+key : value}
+            profil = self.__split_types(mesh, groups_name, e_id)
+        self.__profiles[key] = (mesh, profil)
+        return profil
+
+    def __split_types(self, mesh, groups_name, e_id):
+        """
+        Method which splits a list of elements by type, for each type the elements
+        and their positions in the type elements (profiles index)
+        """
+        e_id = np.sort(np.asarray(e_id, dtype=np.int64))
+        types = mesh.TYPES[e_id]
+        profil = []
+        for code in np.unique(types):
+            e_type = mesh.TYPE_IDS[code]
+            e_list = e_id[types == code]
+            local = np.searchsorted(mesh.ELEMS[e_type], e_list)
+            profil.append((e_type, groups_name+"_"+self.__translator[e_type]['id'], e_list, local))
+        return profil
+
+    def __split_profile(self, mesh, profils):
+        """
+        Method which converts the elements profiles of a Field read in a MED file,
+        {profile name : elements index}, to the __compute_profile format
+        """
+        profil = []
+        for prof_name, e_id in profils.items():
+            split = self.__split_types(mesh, prof_name, e_id)
+            for e_type, type_name, e_list, local in split:
+                ## a profile is defined on one elements type
+                profil.append((e_type, prof_name if len(split) == 1 else type_name, e_list, local))
         return profil
 
 
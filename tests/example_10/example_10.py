@@ -0,0 +1,45 @@
+####
+## Example 10 : add time steps to an existing MED file, as a running
+##              computation which writes its results step by step
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+
+### -> 2 : Write the mesh and the first 3 steps, flushed on disk after each step
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output, flush=1)
+writer.write_mesh(mesh)
+for step in range(3):
+    U = Field("U", ["UX", "UY"], "NODES", mesh)
+    U[:] = step*mesh.COOR[:, :2]
+    writer.write_field_at_time(U, time=step, ite=0.1*step)
+writer.end()
+
+### -> 3 : Open the MED file again and add 2 steps
+writer = MEDWriter(output, mode="a")
+assert writer.get_field_steps("U") == [(0, 0.), (1, 0.1), (2, 0.2)]
+for step in (3, 4):
+    U = Field("U", ["UX", "UY"], "NODES", mesh)
+    U[:] = step*mesh.COOR[:, :2]
+    writer.write_field_at_time(U, time=step, ite=0.1*step)
+writer.end()
+
+### -> 4 : Read back the 5 steps
+reader = MEDReader(output)
+assert reader.read_mesh().NN == 25
+for (time, ite), V in reader.iter_field("U"):
+    assert np.allclose(V[:], time*mesh.COOR[:, :2])
+assert np.array_equal(reader.get_step_index("U")["NDT"], np.arange(5))
+reader.end()
@@ -0,0 +1,44 @@
+####
+## Example 11 : read the steps of a field while they are written (SWMR)
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field, finalize_reserved_steps
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+
+### -> 2 : The mesh and 4 steps of the field are written before the SWMR mode
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output, swmr=True)
+writer.write_mesh(mesh)
+writer.reserve_field_steps("V", mesh, 4, ["V"])
+writer.start_swmr()
+
+### -> 3 : A reader follows the steps written
+reader = MEDReader(output, swmr=True)
+V = Field("V", ["V"], "NODES", mesh)
+for step in range(2):
+    V[:, 0] = step + 1.
+    writer.write_field_at_time(V, time=step, ite=0.5*step)
+    ## only the written steps are seen by the reader
+    assert reader.poll_new_steps("V") == [(step, 0.5*step)]
+    assert np.allclose(reader.read_field_at_time("V", step, 0.5*step)[:, 0], step + 1.)
+
+### -> 4 : The reader is still opened, the steps not written are removed once it is closed
+writer.end()
+reader.end()
+assert finalize_reserved_steps(output)
+
+reader = MEDReader(output)
+steps = reader.get_step_index("V")
+assert np.array_equal(steps["NDT"], [0, 1]) and np.allclose(steps["PDT"], [0., 0.5])
+reader.end()
@@ -0,0 +1,44 @@
+####
+## Example 12 : write many time steps of a field at once
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles, the left half is the group "left"
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+left = np.array([e for e in range(16) if e % 4 < 2])
+mesh.GROUPS = {"left": left}
+
+### -> 2 : 20 steps of a nodal field, array (nsteps, NN, NCOMPO)
+times = 0.05*np.arange(20)
+values = times[:, None, None]*mesh.COOR[None, :, :2]
+## 20 steps of an elements field on the group "left", array (nsteps, 8, 1)
+pressure = np.arange(20.)[:, None, None] + left[None, :, None]
+
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+writer.write_field_series("U", mesh, values, times, components=["UX", "UY"])
+writer.write_field_series("P", mesh, pressure, times, iterations=10*np.arange(20), profile="left",
+                          components=["P"], support="ELEMS")
+writer.end()
+
+### -> 3 : Read back
+reader = MEDReader(output)
+steps = reader.get_step_index("U")
+assert np.array_equal(steps["NDT"], np.arange(20)) and np.allclose(steps["PDT"], times)
+for (time, ite), V in reader.iter_field("U"):
+    assert np.allclose(V[:], ite*mesh.COOR[:, :2])
+assert np.array_equal(reader.get_step_index("P")["NDT"], 10*np.arange(20))
+P = reader.read_field_at_time("P", 30, times[3], sparse=True)
+assert np.allclose(P.dense()[left, 0], 3. + left)
+reader.end()
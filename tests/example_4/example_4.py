@@ -0,0 +1,51 @@
+#### 
+## Example 4 : merge two meshes sharing an interface,
+##             the coincident nodes of the interface are fused
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field, merge_meshes, merge_fields
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build two plates of quadrangles, the second one starts at x = 1
+def plate(name, x0):
+    x, y = np.meshgrid(np.linspace(x0, x0+1., 5), np.linspace(0., 1., 5))
+    coor = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+    quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+    mesh = Mesh(name)
+    mesh.NN = coor.shape[0]
+    mesh.COOR = coor
+    mesh.set_blocks({"QU4": (quads, None, None)})
+    return mesh
+
+left = plate("left", 0.)
+right = plate("right", 1.)
+
+### -> 2 : Merge them, the 5 nodes of the interface x = 1 are fused
+mesh, node_maps, elem_maps = merge_meshes([left, right], tol=1e-8, name="plate")
+print(mesh)
+assert mesh.NN == 45 and mesh.NE == 32
+assert np.array_equal(node_maps[0][4::5], node_maps[1][0::5])
+
+### -> 3 : Merge a nodal field defined on each mesh
+U_left = Field("U", ["X"], "NODES", left)
+U_left[:, 0] = left.COOR[:, 0]
+U_right = Field("U", ["X"], "NODES", right)
+U_right[:, 0] = right.COOR[:, 0]
+U = merge_fields([U_left, U_right], mesh, node_maps, elem_maps)
+assert np.allclose(U[:, 0], mesh.COOR[:, 0])
+
+### -> 4 : Write and read back the merged mesh
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+writer.write_field_at_time(U, time=0, ite=0.)
+writer.end()
+
+reader = MEDReader(output)
+mesh_2 = reader.read_mesh()
+V = reader.read_field_at_time("U", 0, 0.)
+reader.end()
+assert mesh_2.NN == 45 and np.allclose(V[:], U[:])
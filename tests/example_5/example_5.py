@@ -0,0 +1,41 @@
+####
+## Example 5 : read the time steps of a field one at a time
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+
+### -> 2 : Write 10 steps of a nodal field
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+for step in range(10):
+    U = Field("U", ["UX", "UY"], "NODES", mesh)
+    U[:] = step*mesh.COOR[:, :2]
+    writer.write_field_at_time(U, time=step, ite=0.1*step)
+writer.end()
+
+### -> 3 : Iterate over the steps, each step is read when it is used
+reader = MEDReader(output)
+steps = []
+for (time, ite), V in reader.iter_field("U"):
+    assert np.allclose(V[:], time*mesh.COOR[:, :2])
+    steps.append(time)
+assert sorted(steps) == list(range(10))
+
+### -> 4 : Only a few steps, read in the same buffer
+out = np.empty((mesh.NN, 2))
+for (time, ite), V in reader.iter_field("U", steps=[(2, 0.2), (7, 0.7)], out=out):
+    assert np.allclose(out, time*mesh.COOR[:, :2])
+reader.end()
@@ -0,0 +1,49 @@
+####
+## Example 6 : read the values of a few nodes and elements along the steps
+##             of a field (time history)
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles, the left half is the group "left"
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+left = np.array([e for e in range(16) if e % 4 < 2])
+mesh.GROUPS = {"left": left}
+
+### -> 2 : Write 6 steps of a nodal field and of an elements field on "left"
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+for step in range(6):
+    U = Field("U", ["UX", "UY"], "NODES", mesh)
+    U[:] = step*mesh.COOR[:, :2]
+    writer.write_field_at_time(U, time=step, ite=0.5*step)
+    P = Field("P", ["P"], "ELEMS", mesh)
+    P[:, 0] = step + np.arange(16)
+    writer.write_field_at_time(P, groups="left", time=step, ite=0.5*step)
+writer.end()
+
+### -> 3 : History of 2 nodes, array (steps, nodes, components)
+reader = MEDReader(output)
+history = reader.read_history("U", [6, 24])
+assert history.shape == (6, 2, 2)
+assert np.allclose(history[:, 0, 1], np.arange(6)*mesh.COOR[6, 1])
+assert np.allclose(history[:, 1, 0], np.arange(6))
+
+## a single component, the steps read by 2 processes
+assert np.allclose(reader.read_history("U", [6, 24], components=["UY"], jobs=2), history[:, :, 1:])
+
+### -> 4 : History of 2 elements, NaN out of the group "left"
+history = reader.read_history("P", [5, 7])
+assert np.allclose(history[:, 0, 0], np.arange(6) + 5)
+assert np.all(np.isnan(history[:, 1]))
+reader.end()
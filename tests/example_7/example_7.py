@@ -0,0 +1,42 @@
+####
+## Example 7 : write and read back a field defined at the Gauss points
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+
+### -> 2 : A Gauss points field, 4 points by quadrangle, array (NE, NGAUSS, NCOMPO)
+G = Field("G", ["S1", "S2"], "GAUSS", mesh)
+assert G.NGAUSS == {"QU4": 4}
+G[:, :, 0] = np.arange(16)[:, None]
+G[:, :, 1] = np.arange(4)[None, :]
+
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+writer.write_field_at_time(G, time=0, ite=0.)
+writer.end()
+
+### -> 3 : Read back, the localization of the Gauss points is stored with the field
+reader = MEDReader(output)
+G_2 = reader.read_field_at_time("G", 0, 0.)
+assert G_2.NGAUSS == {"QU4": 4} and np.allclose(G_2[:], G[:])
+localizations = reader.get_gauss_localizations()
+assert localizations["QU4__PG"]["gauss"].shape == (4, 2)
+
+### -> 4 : History of 2 elements, array (steps, elements, NGAUSS, NCOMPO)
+history = reader.read_history("G", [3, 10])
+assert history.shape == (1, 2, 4, 2)
+assert np.allclose(history[0], G[[3, 10]])
+reader.end()
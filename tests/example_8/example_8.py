@@ -0,0 +1,50 @@
+####
+## Example 8 : fields defined on a part of the mesh, stored as sparse fields
+##             (values and index of the entities) instead of dense arrays
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles, the left half is the group "left"
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+left = np.array([e for e in range(16) if e % 4 < 2])
+mesh.GROUPS = {"left": left}
+
+### -> 2 : An elements field written on the group "left" only
+P = Field("P", ["P"], "ELEMS", mesh)
+P[left, 0] = 1. + left
+
+### -> 3 : A sparse field, only the values of a few nodes are stored
+nodes = np.array([3, 7, 12, 20])
+T = Field("T", ["T"], "NODES", mesh, index=nodes)
+T[:, 0] = 10.*nodes
+
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+writer.write_field_at_time(P, groups="left", time=0, ite=0.)
+writer.write_field_at_time(T, time=0, ite=0.)
+writer.end()
+
+### -> 4 : Read back, the fields written on a profile can be read as sparse fields
+reader = MEDReader(output)
+P_2 = reader.read_field_at_time("P", 0, 0., sparse=True)
+assert np.array_equal(np.sort(P_2.INDEX), left)
+assert np.allclose(P_2.dense()[:, 0], P[:, 0])
+
+T_2 = reader.read_field_at_time("T", 0, 0., sparse=True)
+assert np.array_equal(T_2.INDEX, nodes) and np.allclose(T_2[:, 0], 10.*nodes)
+## the dense values are 0 out of the profile
+T_3 = reader.read_field_at_time("T", 0, 0.)
+assert np.allclose(T_3[nodes, 0], 10.*nodes)
+assert np.count_nonzero(T_3[:, 0]) == len(nodes)
+reader.end()
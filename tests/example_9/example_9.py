@@ -0,0 +1,53 @@
+####
+## Example 9 : spatial queries on a mesh, nearest nodes, location of points
+##             in the elements and interpolation of a nodal field
+##
+###
+
+from pyMEDio import MEDReader, MEDWriter, Mesh, Field
+import numpy as np
+import os
+import tempfile
+
+### -> 1 : Build a plate of 4x4 quadrangles on [0, 1]x[0, 1] and write it
+x, y = np.meshgrid(np.linspace(0., 1., 5), np.linspace(0., 1., 5))
+quads = np.array([[j*5+i, j*5+i+1, (j+1)*5+i+1, (j+1)*5+i] for j in range(4) for i in range(4)])
+mesh = Mesh("plate")
+mesh.NN = 25
+mesh.COOR = np.c_[x.ravel(), y.ravel(), np.zeros(25)]
+mesh.set_blocks({"QU4": (quads, None, None)})
+
+## a linear field is interpolated exactly
+U = Field("U", ["UX", "UY"], "NODES", mesh)
+U[:, 0] = 2.*mesh.COOR[:, 0] + mesh.COOR[:, 1]
+U[:, 1] = -mesh.COOR[:, 1]
+
+output = os.path.join(tempfile.mkdtemp(), "output.med")
+writer = MEDWriter(output)
+writer.write_mesh(mesh)
+writer.write_field_at_time(U, time=0, ite=0.)
+writer.end()
+
+reader = MEDReader(output)
+mesh_2 = reader.read_mesh()
+U_2 = reader.read_field_at_time("U", 0, 0.)
+reader.end()
+
+points = np.array([[0.1, 0.1, 0.], [0.5, 0.6, 0.], [0.99, 0.26, 0.], [2., 2., 0.]])
+
+### -> 2 : Nearest node of each point
+nodes, distances = mesh_2.nearest_nodes(points)
+assert np.array_equal(nodes, [0, 12, 9, 24])
+assert np.allclose(distances, np.linalg.norm(mesh_2.COOR[nodes] - points, axis=1))
+
+### -> 3 : Element containing each point, -1 out of the mesh
+elements, connec, weights = mesh_2.locate_points(points)
+assert np.array_equal(elements, [0, 10, 7, -1])
+assert np.allclose(weights[:3].sum(axis=1), 1.)
+assert np.allclose(np.einsum("ij,ijk->ik", weights[:3], mesh_2.COOR[connec[:3]]), points[:3])
+
+### -> 4 : Values of the field at the points, NaN out of the mesh
+values = U_2.evaluate(points)
+assert np.allclose(values[:3, 0], 2.*points[:3, 0] + points[:3, 1])
+assert np.allclose(values[:3, 1], -points[:3, 1])
+assert np.all(np.isnan(values[3]))
@@ -1,6 +1,8 @@
 
+import sys
+import json
 import argparse
-from pyMEDio import MEDReader
+from pyMEDio import MEDReader, quiet
 
 
 
@@ -9,33 +11,45 @@ parser = argparse.ArgumentParser(description='medinfo \n Utility to simply visua
 parser.add_argument('medfile', type=str, help="the med file to investigate")
 parser.add_argument('-m', '--mesh',action="store_true")
 parser.add_argument('-f', '--field',action="store_true")
+parser.add_argument('--json',action="store_true", help="print the metadata of the file in json")
 
 args = parser.parse_args()
 
+if args.json:
+    quiet()
 med = MEDReader(args.medfile)
+metadata = med.scan_metadata()
+
+if args.json:
+    json.dump(metadata, sys.stdout, indent=1)
+    print("")
+    med.end()
+    sys.exit(0)
 
 
 if args.mesh:
-    meshes = med.get_meshes_names()
+    meshes = metadata["meshes"]
     print("************ Mesh stored in {} *************\n".format(args.medfile))
     for mesh in meshes:
         print(" -> MESH : {}".format(mesh))
-        msh_info = med.get_mesh_info(mesh)
+        msh_info = meshes[mesh]
         print("      Number of nodes       : {}".format(msh_info['NN']))
         print("      Number of elements    : {}".format(msh_info['NE']))
-        for tup in msh_info['ELEMS']:
+        for tup in msh_info['ELEMS'].items():
             print("       * {} :    {}".format(*tup))
         print("      Groups                : {}".format(", ".join(msh_info['GROUPS'])))
+        if len(msh_info['NODE_GROUPS']) != 0:
+            print("      Nodes groups          : {}".format(", ".join(msh_info['NODE_GROUPS'])))
 
 print(" ")
 
 if args.field:
-    fields = med.get_fields_names()
+    fields = metadata["fields"]
     print("*********** Fields stored in {} ***********\n".format(args.medfile))
     for field in fields:
         print(' -> FIELD : {}'.format(field))
-        field_info = med.get_field_info(field)
-        print("      Support               : {} on mesh {}".format(*field_info["support"]))
+        field_info = fields[field]
+        print("      Support               : {} on mesh {}".format(field_info["support"], field_info["mesh"]))
         print("      Components            : {}".format(", ".join(field_info['components'])))
         print("      Steps                 : {}".format("; ".join([ str(x) for x in field_info["steps"]])))
 
@@ -4,11 +4,13 @@
 #####  @author : Basile Marchand
 #####
 
-import re
-import os
+import sys
 import argparse
+from collections import deque
+from multiprocessing import Pool
 
-from pyMEDio import MEDReader, MEDWriter, verbose, quiet
+import numpy as np
+from pyMEDio import MEDReader, MEDWriter, Field, quiet
 
 def open_all(output_name, input_name):
     medoutput = MEDWriter(output_name)
@@ -28,7 +30,10 @@ def copy_mesh(medoutput, medinput):
     """
     msh = medinput[0].read_mesh()
     medoutput.write_mesh(msh)
-    
+    ## the Gauss points fields keep the Gauss points of the input files
+    medoutput.write_gauss_localizations(medinput[0].get_gauss_localizations())
+    return msh
+
 def list_fields_input(medinput):
     fields_names = medinput[0].get_fields_names()
     for med in medinput[1:]:
@@ -38,20 +43,78 @@ def list_fields_input(medinput):
             sys.exit(2)
     return fields_names
 
-def merge_field(field_name, output_med, input_med):
+def read_steps(task):
+    """
+    Read all steps of a field in a med file, run in the worker processes.
+    Only the raw values are returned, the mesh is not read.
+    """
+    med_file, field_name = task
+    quiet()
+    med = MEDReader(med_file)
+    steps = []
+    for time, ite in med.get_field_info(field_name)["steps"]:
+        support, values, components, profil, index = med.read_field_values(field_name, time, ite)
+        ngauss = med.get_gauss_points(field_name, time) if support == "GAUSS" else None
+        steps.append((ite, support, np.asarray(values), components, profil, index, ngauss))
+    med.end()
+    return steps
+
+def bounded_imap(pool, func, tasks, window):
+    """
+    Ordered imap over a pool with at most window tasks submitted and not yet
+    consumed : the input files are read only a few files ahead of the writing,
+    the memory used doesn't depend on the number of input files.
+    """
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(func, (task,)))
+    while len(pending) != 0:
+        yield pending.popleft().get()
+
+def copy_field(field_name, output_med, input_med):
+    """
+    Merge the steps of field_name of all input files by copying the HDF5
+    datasets, without decoding them, steps are renumbered as in merge_field
+    """
     step = 0
     for med in input_med:
-        fields = med.read_field(field_name)
-        for field in fields:
-            output_med.write_field_at_time(field, step, step)
+        step += output_med.copy_field_steps(med, field_name, step)
+
+def merge_field(field_name, output_med, input_files, mesh, pool=None, jobs=1):
+    """
+    Merge the steps of field_name of all input files, steps are renumbered
+    following the order of the input files then the order of the steps in each file.
+    With a pool of jobs processes the input files are read in parallel, at most
+    jobs files ahead of the writing, the steps are always written in the same
+    order by the current process.
+    """
+    tasks = [(med_file, field_name) for med_file in input_files]
+    if pool is None:
+        results = map(read_steps, tasks)
+    else:
+        results = bounded_imap(pool, read_steps, tasks, jobs)
+    step = 0
+    for steps in results:
+        for ite, support, values, components, profil, index, ngauss in steps:
+            field = Field(field_name, components, support, mesh, ngauss=ngauss)
+            field.PROFILS = profil
+            if index is None:
+                field[:] = values
+            else:
+                field[index] = values
+            output_med.write_field_at_time(field, time=step, ite=ite)
             step += 1
-    
+
 
 if __name__ == "__main__":
     quiet()
     ## input arguments
     parser = argparse.ArgumentParser()
     parser.add_argument("-f", "--field", nargs="+", default="all", help="Name of field to merge in the result med file")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of processes used to read the input med files")
+    parser.add_argument("-r", "--raw", action="store_true", help="Copy the fields datasets without decoding them, fastest")
     parser.add_argument("medoutput",  help="Name of the ouput med file (overwritte file if already exists)")
     parser.add_argument("medinput", nargs='+', help="List of medfiles to merge, can be given as a regular expression")
     args = parser.parse_args()
@@ -60,20 +123,27 @@ if __name__ == "__main__":
     medoutput, medinput = open_all(args.medoutput, args.medinput)
 
     ## Copy mesh
-    copy_mesh(medoutput, medinput)
+    mesh = copy_mesh(medoutput, medinput)
 
-    ## MERGE FIELD    
+    ## MERGE FIELD
     if args.field == "all":
         ## merge all field define in med files
         field_list = list_fields_input(medinput)
     else:
-        field_list = args.field_name
+        field_list = args.field
 
+    pool = Pool(args.jobs) if args.jobs > 1 else None
     for field_name in field_list:
         print("** Merge field : " + field_name)
-        merge_field(field_name, medoutput, medinput)
-     
+        if args.raw:
+            copy_field(field_name, medoutput, medinput)
+        else:
+            merge_field(field_name, medoutput, args.medinput, mesh, pool, args.jobs)
+    if pool is not None:
+        pool.close()
+        pool.join()
+
 
     close_all(medoutput, medinput)
 
-            
+